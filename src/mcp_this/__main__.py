@@ -8,10 +8,13 @@ The server reads YAML configuration files to define tools that map to shell comm
 making them available to Claude without requiring any code.
 """
 
+import asyncio
 import os
 import sys
 import argparse
 import pathlib
+from collections.abc import Callable
+import anyio
 from mcp_this.mcp_server import mcp, init_server
 
 def find_default_config() -> str | None:
@@ -49,6 +52,41 @@ def get_preset_config(preset_name: str) -> str | None:
         return str(preset_path)
     return None
 
+def uvloop_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    Get uvloop's event loop factory if uvloop is installed.
+
+    uvloop is an optional, faster drop-in replacement for the asyncio event loop (installed with
+    the `uvloop` extra), which speeds up the subprocess and pipe handling done for every tool call.
+
+    Returns:
+        Optional[Callable]: uvloop.new_event_loop, or None to use the default asyncio event loop
+    """
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop  # noqa: PLC0415 - optional dependency, only imported when available
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+def serve(transport: str) -> None:
+    """
+    Run the MCP server with the given transport, on a uvloop event loop if uvloop is installed.
+
+    This does what mcp.run does, but passes the loop factory to the event loop runner instead of
+    changing the global event loop policy.
+
+    Args:
+        transport: Transport protocol to use ("stdio", "sse", or "streamable-http")
+    """
+    run_async = {
+        "stdio": mcp.run_stdio_async,
+        "sse": mcp.run_sse_async,
+        "streamable-http": mcp.run_streamable_http_async,
+    }[transport]
+    anyio.run(run_async, backend_options={"loop_factory": uvloop_loop_factory()})
+
 def main() -> None:
     """Run the MCP server with the specified configuration."""
     parser = argparse.ArgumentParser(description="Dynamic CLI Tools MCP Server")
@@ -113,7 +151,7 @@ def main() -> None:
         # Initialize the server with the configuration
         init_server(config_path=config_path, tools=tools)
         # Run the MCP server with the specified transport
-        mcp.run(transport=args.transport)
+        serve(args.transport)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
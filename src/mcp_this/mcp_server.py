@@ -11,8 +11,16 @@ import re
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 import sys
-from collections.abc import Callable
-from mcp_this.tools import ToolInfo, build_command, execute_command, parse_tools
+import inspect
+from collections.abc import Awaitable, Callable
+from mcp_this.tools import (
+    ToolInfo,
+    build_command,  # noqa: F401 - re-exported for existing imports
+    create_tool_handler,
+    execute_command,  # noqa: F401 - re-exported for existing imports
+    max_concurrency,
+    parse_tools,
+)
 from mcp_this.prompts import PromptInfo, parse_prompts
 
 
@@ -193,16 +201,8 @@ def register_parsed_tools(tools_info: list[ToolInfo]) -> None:
     """
     for tool_info in tools_info:
         try:
-            # Create a unique namespace for this function
-            tool_namespace = {
-                "tool_info": tool_info.runtime_info,
-                "build_command": build_command,
-                "execute_command": execute_command,
-            }
-            # Execute the code to create the function
-            exec(tool_info.exec_code, tool_namespace)
-            # Get the created function
-            handler = tool_namespace[tool_info.function_name]
+            # Create the function that runs this tool's command
+            handler = create_tool_handler(tool_info)
             # Register the function with MCP
             mcp.tool(
                 name=tool_info.tool_name,
@@ -213,6 +213,52 @@ def register_parsed_tools(tools_info: list[ToolInfo]) -> None:
             traceback.print_exc()
 
 
+def create_prompt_handler(prompt_info: PromptInfo) -> Callable[..., Awaitable[str]]:
+    """
+    Create the async function that MCP calls to render a prompt.
+
+    The prompt's template is captured in a closure, and its arguments are exposed through
+    `__signature__` and `__annotations__`, which MCP inspects to build the prompt's arguments.
+
+    Args:
+        prompt_info: The PromptInfo object describing the prompt.
+
+    Returns:
+        An async function that renders the prompt's template with the given arguments.
+    """
+    template = prompt_info.template
+
+    async def handler(**kwargs: str) -> str:
+        return render_template(template, kwargs)
+
+    # Build the signature from the prompt arguments (required arguments must come first)
+    required_args = []
+    optional_args = []
+    annotations = {}
+    for arg_name, arg_info in prompt_info.arguments.items():
+        if arg_info.required:
+            required_args.append(
+                inspect.Parameter(arg_name, inspect.Parameter.POSITIONAL_OR_KEYWORD),
+            )
+        else:
+            optional_args.append(
+                inspect.Parameter(
+                    arg_name,
+                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                    default='',
+                    annotation=str,
+                ),
+            )
+            annotations[arg_name] = str
+    annotations['return'] = str
+
+    handler.__signature__ = inspect.Signature(
+        required_args + optional_args, return_annotation=str,
+    )
+    handler.__annotations__ = annotations
+    return handler
+
+
 def register_prompts(prompts_info: list[PromptInfo]) -> None:
     """
     Register prompts with MCP based on parsed prompt information.
@@ -222,41 +268,6 @@ def register_prompts(prompts_info: list[PromptInfo]) -> None:
     """
     for prompt_info in prompts_info:
         try:
-            # Create prompt handler function dynamically
-            def create_prompt_handler(prompt_info: PromptInfo) -> Callable:
-
-                # Build function signature dynamically based on prompt arguments
-                required_args = []
-                optional_args = []
-
-                for arg_name, arg_info in prompt_info.arguments.items():
-                    if arg_info.required:
-                        required_args.append(arg_name)
-                    else:
-                        optional_args.append(f"{arg_name}: str = ''")
-
-                # Create function signature
-                sig_parts = required_args + optional_args
-                signature = ", ".join(sig_parts)
-
-                # Create the actual handler function
-                func_code = (
-                    f"async def handler({signature}) -> str:\n"
-                    "    return render_template(template, locals())"
-                )
-
-                # Create namespace with the template and renderer
-                namespace = {
-                    "template": prompt_info.template,
-                    "render_template": render_template,
-                }
-
-                # Execute the function definition
-                exec(func_code, namespace)
-
-                # Return the created function
-                return namespace["handler"]
-
             # Create and register the prompt handler
             handler = create_prompt_handler(prompt_info)
             mcp.prompt(name=prompt_info.name, description=prompt_info.description)(handler)
@@ -305,12 +316,14 @@ def init_server(config_path: str | None = None, tools: str | None = None) -> Non
                     Takes precedence over config_path if both are provided.
 
     Raises:
-        ValueError: If the configuration is invalid.
+        ValueError: If the configuration or MCP_THIS_MAX_CONCURRENCY is invalid.
         FileNotFoundError: If the configuration file does not exist.
         JSONDecodeError: If the JSON configuration string is invalid.
     """
     config = load_config(config_path, tools)
     validate_config(config)
+    # Reject an invalid MCP_THIS_MAX_CONCURRENCY now rather than failing every tool call
+    max_concurrency()
     register_all(config)
 
 
@@ -9,7 +9,11 @@ import re
 from dataclasses import dataclass
 
 
-@dataclass
+# Argument names become handler parameters, so they must be Python identifiers
+_ARG_NAME_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+
+@dataclass(slots=True)
 class PromptArgument:
     """Represents an argument for a prompt."""
 
@@ -17,7 +21,7 @@ class PromptArgument:
     required: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class PromptInfo:
     """Represents a prompt with its metadata and arguments."""
 
@@ -75,7 +79,7 @@ def validate_prompt_argument_config(prompt_name: str, arg_name: str, arg_config:
         ValueError: If the argument configuration is invalid.
     """
     # Validate argument name for Python identifier compatibility
-    if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', arg_name):
+    if not _ARG_NAME_RE.match(arg_name):
         raise ValueError(
             f"Argument name '{arg_name}' in prompt '{prompt_name}' contains invalid characters. "
             "Argument names must be valid Python identifiers (letters, numbers, underscores, "
@@ -132,13 +136,10 @@ def parse_prompts(config: dict) -> list[PromptInfo]:
         validate_prompt_config(prompt_name, prompt_config)
 
         # Parse arguments
-        arguments = {}
-        if 'arguments' in prompt_config:
-            for arg_name, arg_config in prompt_config['arguments'].items():
-                arguments[arg_name] = PromptArgument(
-                    description=arg_config['description'],
-                    required=arg_config['required'],
-                )
+        arguments = {
+            arg_name: PromptArgument(arg_config['description'], arg_config['required'])
+            for arg_name, arg_config in prompt_config.get('arguments', {}).items()
+        }
 
         prompt_info = PromptInfo(
             name=prompt_name,
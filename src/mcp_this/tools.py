@@ -1,12 +1,90 @@
 """Helper functions and classes for managing tools and commands."""
+import os
 import re
+import sys
+import functools
+import itertools
 import traceback
 import asyncio
+import inspect
+import logging
+import math
 import subprocess
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# A parameter placeholder in a command template, e.g. `<<file_path>>`
+_PLACEHOLDER_RE = re.compile(r'<<(\w+)>>')
+
+# A run of whitespace (spaces, tabs, newlines) in a command template
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Characters that are not allowed in a Python identifier (used to derive function names)
+_NON_IDENT_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+# Characters that need a shell to interpret them (pipes, redirection, quoting, expansion, etc.)
+_SHELL_SYNTAX_RE = re.compile(r'[|&;<>()$`\\"\'*?\[\]{}~!#\n\r]')
+
+# A word of a command with no shell syntax (the shell splits such commands on spaces and tabs)
+_COMMAND_WORD_RE = re.compile(r'[^ \t]+')
+
+# Shell builtins and keywords whose behavior differs from (or has no) standalone executable,
+# so commands starting with them always run through the shell
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "[", "alias", "cd", "command", "echo", "eval", "exec", "exit", "export", "kill",
+    "printf", "pwd", "read", "set", "source", "test", "time", "type", "ulimit", "umask",
+    "unset", "wait",
+})
+
+# Size of each read from a subprocess pipe when streaming command output
+_READ_CHUNK_SIZE = 65536
+
+# Environment variable that caps how many commands may be started at the same time
+_MAX_CONCURRENCY_ENV = "MCP_THIS_MAX_CONCURRENCY"
+
+# cgroup v2 file with this process's CPU quota and period, e.g. "200000 100000" or "max 100000"
+_CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+# The event loop the command semaphore was created for, and the semaphore itself
+_command_semaphore: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
+
+# Keywords in a command template that indicate the command may delete, move or write data,
+# grouped by the note they trigger in the tool description. Note-only keywords add the notes
+# section without a specific warning.
+_DELETE_KEYWORDS = ("rm ", "remove ", "delete ")
+_MOVE_KEYWORDS = ("mv ", "move ")
+_WRITE_KEYWORDS = ("write ", "create ", " > ", " >> ")
+_NOTE_ONLY_KEYWORDS = ("echo ", "cat ", "touch ")
+
+# The kind of side effect each keyword indicates
+_SIDE_EFFECT_CATEGORIES = {
+    **dict.fromkeys(_DELETE_KEYWORDS, "delete"),
+    **dict.fromkeys(_MOVE_KEYWORDS, "move"),
+    **dict.fromkeys(_WRITE_KEYWORDS, "write"),
+    **dict.fromkeys(_NOTE_ONLY_KEYWORDS, None),
+}
+
+# The note added to the tool description for each kind of side effect, in display order
+_SIDE_EFFECT_NOTES = (
+    ("delete", "- This command can DELETE files or data. Use with caution."),
+    ("move", "- This command can MOVE files or data. Verify paths are correct."),
+    ("write", "- This command can CREATE or MODIFY files or data."),
+)
+
+# The lookahead makes a single scan report every occurrence, including overlapping ones
+# (e.g. "move " inside "remove "). Matching is case-insensitive for ASCII letters only, the
+# same as lowercasing the command first.
+_SIDE_EFFECT_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _SIDE_EFFECT_CATEGORIES)) + "))",
+    re.IGNORECASE | re.ASCII,
+)
+
+
+@dataclass(slots=True)
 class ToolInfo:
     """Information about a parsed tool from the configuration."""
 
@@ -16,8 +94,14 @@ class ToolInfo:
     description: str
     parameters: dict[str, dict]
     param_string: str
-    exec_code: str
-    runtime_info: dict[str, any]  # Information needed by the generated function at runtime
+    runtime_info: dict[str, any]  # Information needed by the tool's handler at runtime
+    # Cached result of get_full_description()
+    _full_description: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def parameter_names(self) -> tuple[str, ...]:
+        """Names of the tool's parameters, in the order they are defined in the configuration."""
+        return tuple(self.parameters)
 
     def get_full_description(self) -> str:
         """
@@ -29,65 +113,125 @@ class ToolInfo:
         Returns:
             A formatted description with key sections highlighted for LLM processing.
         """
-        lines = []
-
-        # Start with a clear TOOL DESCRIPTION section
-        lines.append("TOOL DESCRIPTION:")
-        lines.append("")
-        lines.append(self.description.strip())
-
-        # Add the COMMAND section showing the template
-        lines.append("")
-        lines.append("COMMAND CALLED:")
-        lines.append("")
-        lines.append(f"`{self.command_template}`")
+        if self._full_description is not None:
+            return self._full_description
 
+        sections = itertools.chain(
+            self._format_header(),
+            self._format_parameters(),
+            self._format_notes(),
+        )
+        # Join all lines with newlines to form the complete description
+        self._full_description = "\n".join(sections)
+        return self._full_description
+
+    def _format_header(self) -> list[str]:
+        """Format the TOOL DESCRIPTION and COMMAND CALLED sections of the description."""
+        header = [
+            "TOOL DESCRIPTION:",
+            "",
+            self.description.strip(),
+            "",
+            "COMMAND CALLED:",
+            "",
+            f"`{self.command_template}`",
+        ]
         # Add clarification on what the placeholders mean, if there are parameters
-        if "<<" in self.command_template and self.parameters:
+        if self.parameters and "<<" in self.command_template:
             # Get the first parameter name to use as example
-            first_param = next(iter(self.parameters.keys()), "parameter")
-            lines.append("")
-            lines.append(f"Text like <<parameter_name>> (e.g. <<{first_param}>>) will be replaced with parameter values.")  # noqa: E501
-
-        # Add PARAMETERS section with clearly marked requirements
-        if self.parameters:
-            lines.append("")
-            lines.append("PARAMETERS:")
-            lines.append("")
-
-            # Add each parameter with its description and inferred type
-            for param_name, param_config in self.parameters.items():
-                desc = param_config.get("description", "")
-                required = param_config.get("required", False)
-                req_status = "[REQUIRED]" if required else "[OPTIONAL]"
-
-                # All parameters are treated as strings for CLI commands
-                param_type = "(string)"
-
-                lines.append(f"- {param_name} {req_status}{' ' + param_type if param_type else ''}: {desc}")  # noqa: E501
-
-
-        # Add NOTES section if the command could have side effects
-        cmd_lower = self.command_template.lower()
-        dangerous_operations = ["rm ", "remove ", "delete ", "mv ", "move ", "write ", "create "]
-        file_write_operators = [" > ", " >> ", "echo ", "cat ", "touch "]
-
-        has_dangerous_operation = any(op in cmd_lower for op in dangerous_operations)
-        has_file_write_operation = any(op in cmd_lower for op in file_write_operators)
-
-        if has_dangerous_operation or has_file_write_operation:
-            lines.append("")
-            lines.append("IMPORTANT NOTES:")
-            lines.append("")
-            if any(op in cmd_lower for op in ["rm ", "remove ", "delete "]):
-                lines.append("- This command can DELETE files or data. Use with caution.")
-            if any(op in cmd_lower for op in ["mv ", "move "]):
-                lines.append("- This command can MOVE files or data. Verify paths are correct.")
-            if any(op in cmd_lower for op in ["write ", "create "]) or " > " in cmd_lower or " >> " in cmd_lower:  # noqa: E501
-                lines.append("- This command can CREATE or MODIFY files or data.")
+            first_param = next(iter(self.parameters))
+            header.extend((
+                "",
+                f"Text like <<parameter_name>> (e.g. <<{first_param}>>) will be replaced with parameter values.",  # noqa: E501
+            ))
+        return header
+
+    def _format_parameters(self) -> list[str]:
+        """Format the PARAMETERS section, with each parameter's requirement clearly marked."""
+        if not self.parameters:
+            return []
+        # All parameters are treated as strings for CLI commands
+        return [
+            "",
+            "PARAMETERS:",
+            "",
+            *(
+                f"- {param_name} {'[REQUIRED]' if param_config.get('required', False) else '[OPTIONAL]'} (string): {param_config.get('description', '')}"  # noqa: E501
+                for param_name, param_config in self.parameters.items()
+            ),
+        ]
+
+    def _format_notes(self) -> list[str]:
+        """Format the IMPORTANT NOTES section if the command could have side effects."""
+        # A single scan finds every dangerous or file-write keyword in the command
+        matches = _SIDE_EFFECT_RE.findall(self.command_template)
+        if not matches:
+            return []
+        categories = {_SIDE_EFFECT_CATEGORIES[keyword.lower()] for keyword in matches}
+        notes = ["", "IMPORTANT NOTES:", ""]
+        notes.extend(note for category, note in _SIDE_EFFECT_NOTES if category in categories)
+        return notes
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_template_whitespace(command_template: str) -> str:
+    """Join the lines of a command template and collapse runs of whitespace to one space."""
+    return _WHITESPACE_RE.sub(" ", command_template).strip()
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_command_template(
+    command_template: str,
+    provided: frozenset[str],
+) -> tuple[tuple[str, ...], tuple[str, ...], frozenset[str]]:
+    """
+    Split a command template into the literal text around the placeholders to be filled.
 
-        # Join all lines with newlines to form the complete description
-        return "\n".join(lines)
+    The result depends only on the template and on which parameters have values, so it is
+    computed once per combination and reused; rendering a command is then a plain join.
+
+    Args:
+        command_template: The command template with parameter placeholders.
+        provided: Names of the parameters that have (non-empty) values.
+
+    Returns:
+        A tuple `(literals, names, unplaced)` where `literals` has one more item than `names`,
+        the command is `literals[0] + value(names[0]) + literals[1] + ...`, and `unplaced`
+        holds the provided parameters that have no placeholder in the template.
+    """
+    # Step 1: Remove placeholders for parameters that don't exist or are empty (single pass)
+    removed_placeholder = False
+
+    def _strip_missing(match: re.Match) -> str:
+        nonlocal removed_placeholder
+        if match.group(1) in provided:
+            return match.group(0)
+        removed_placeholder = True
+        return ""
+
+    result = _PLACEHOLDER_RE.sub(_strip_missing, command_template)
+
+    # Step 2: Clean up command structure whitespace (joins lines and collapses multiple spaces)
+    # (No content is in the string yet, so this is safe)
+    if removed_placeholder:
+        result = _WHITESPACE_RE.sub(" ", result).strip()
+    else:
+        result = _normalize_template_whitespace(command_template)
+
+    # Split into alternating literal text and placeholder names. Placeholders for parameters
+    # without a value can only remain here if removing another placeholder formed them; they
+    # are kept as literal text.
+    pieces = _PLACEHOLDER_RE.split(result)
+    literals = [pieces[0]]
+    names = []
+    for param_name, literal in zip(pieces[1::2], pieces[2::2]):
+        if param_name in provided:
+            names.append(param_name)
+            literals.append(literal)
+        else:
+            literals[-1] += f"<<{param_name}>>{literal}"
+
+    return tuple(literals), tuple(names), provided.difference(names)
 
 
 def build_command(command_template: str, parameters: dict[str, str]) -> str:
@@ -110,31 +254,150 @@ def build_command(command_template: str, parameters: dict[str, str]) -> str:
         The processed command string with parameters substituted and cleaned up.
         Example: "tail -n 10 -f \"/var/log/syslog\""
     """
-    result = command_template
-    parameters = {k: v for k, v in parameters.items() if v is not None and v != ""}
+    # Only copy the parameters when some of them are empty (they are treated as not provided)
+    values = parameters
+    if any(v is None or v == "" for v in parameters.values()):
+        values = {k: v for k, v in parameters.items() if v is not None and v != ""}
+
+    # Fast path: a template without placeholders only needs its whitespace cleaned up
+    if "<<" not in command_template:
+        if values:
+            param_name = next(iter(values))
+            raise ValueError(f"Placeholder '<<{param_name}>>' not found in command template.")
+        return _normalize_template_whitespace(command_template)
+
+    literals, names, unplaced = _compile_command_template(command_template, frozenset(values))
+    if unplaced:
+        param_name = next(name for name in values if name in unplaced)
+        raise ValueError(f"Placeholder '<<{param_name}>>' not found in command template.")
+
+    # Substitute actual parameter values (preserving their formatting)
+    parts = [literals[0]]
+    for param_name, literal in zip(names, literals[1:]):
+        parts.extend((str(values[param_name]), literal))
+    return "".join(parts)
+
+
+async def _drain(reader: asyncio.StreamReader) -> str:
+    """
+    Read a subprocess pipe to EOF and decode it as UTF-8.
 
-    # Step 1: Remove placeholders for parameters that don't exist or are empty
-    all_placeholders = re.findall(r'<<(\w+)>>', result)
-    for param_name in all_placeholders:
-        placeholder = f"<<{param_name}>>"
-        if param_name not in parameters:
-            result = result.replace(placeholder, "")
+    Chunks are appended to a single bytearray, which is decoded once at the end.
 
-    # Step 2: Clean up command structure whitespace
-    # (No content is in the string yet, so this is safe)
-    lines = [line.strip() for line in result.split('\n') if line.strip()]
-    result = ' '.join(lines)
-    # Normalize multiple spaces to a single space
-    result = " ".join(result.split())
+    Args:
+        reader: The stdout or stderr stream of a subprocess.
+
+    Returns:
+        The decoded contents of the stream.
+    """
+    buffer = bytearray()
+    while chunk := await reader.read(_READ_CHUNK_SIZE):
+        buffer += chunk
+    return buffer.decode()
 
-    # Step 3: Now substitute actual parameter values (preserving their formatting)
-    for param_name, param_value in parameters.items():
-        placeholder = f"<<{param_name}>>"
-        if placeholder not in result:
-            raise ValueError(f"Placeholder '{placeholder}' not found in command template.")
-        result = result.replace(placeholder, str(param_value))
 
-    return result
+def _cgroup_cpu_limit() -> int | None:
+    """
+    Get the number of CPUs the cgroup v2 `cpu.max` quota allows this process to use.
+
+    Docker and Kubernetes CPU limits set this quota rather than restricting the CPU set, so
+    `os.sched_getaffinity` does not see them.
+
+    Returns:
+        The quota rounded up to whole CPUs, or None if there is no quota or it can't be read.
+    """
+    try:
+        quota, period = _CGROUP_CPU_MAX.read_text().split()
+        if quota == "max":
+            return None
+        return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        return None
+
+
+def max_concurrency() -> int:
+    """
+    Get the maximum number of commands that may be started at the same time.
+
+    Uses the MCP_THIS_MAX_CONCURRENCY environment variable if it is set, otherwise the number of
+    CPUs this process is allowed to run on (its CPU set, capped by any cgroup CPU quota).
+
+    Returns:
+        The maximum number of concurrent commands.
+
+    Raises:
+        ValueError: If MCP_THIS_MAX_CONCURRENCY is not a positive integer.
+    """
+    value = os.environ.get(_MAX_CONCURRENCY_ENV)
+    if value:
+        error = f"{_MAX_CONCURRENCY_ENV} must be a positive integer, got '{value}'"
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValueError(error) from None
+        if limit < 1:
+            raise ValueError(error)
+        return limit
+    if hasattr(os, "sched_getaffinity"):
+        # Respects CPU sets (e.g. taskset or cpuset limits), unlike os.cpu_count()
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 4
+    cgroup_cpus = _cgroup_cpu_limit()
+    return min(cpus, cgroup_cpus) if cgroup_cpus else cpus
+
+
+def _get_command_semaphore() -> asyncio.Semaphore:
+    """
+    Get the semaphore that limits concurrent command starts, creating it for the running loop.
+
+    A semaphore can only be used from one event loop, so a new one is created if the loop
+    changes (e.g. the server is restarted in the same process).
+
+    Returns:
+        The semaphore for the running event loop.
+    """
+    global _command_semaphore  # noqa: PLW0603
+    loop = asyncio.get_running_loop()
+    if _command_semaphore is None or _command_semaphore[0] is not loop:
+        _command_semaphore = (loop, asyncio.Semaphore(max_concurrency()))
+    return _command_semaphore[1]
+
+
+async def _spawn(cmd: str) -> asyncio.subprocess.Process:
+    """
+    Start a command with its stdout and stderr piped.
+
+    Simple commands (no shell syntax) are executed directly, which avoids starting an
+    intermediate `/bin/sh` for every call. Anything else, or anything that cannot be executed
+    directly, runs through the shell as before.
+
+    Args:
+        cmd: The shell command to start.
+
+    Returns:
+        The started process.
+    """
+    if not _SHELL_SYNTAX_RE.search(cmd):
+        argv = _COMMAND_WORD_RE.findall(cmd)
+        # Variable assignments (FOO=bar cmd) and builtins need the shell
+        if argv and '=' not in argv[0] and argv[0] not in _SHELL_BUILTINS:
+            try:
+                return await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    cwd=None,
+                )
+            except OSError:
+                # e.g. not found or not executable; let the shell run it and report the error
+                pass
+    return await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=None,
+    )
 
 
 async def execute_command(cmd: str) -> str:
@@ -156,24 +419,28 @@ async def execute_command(cmd: str) -> str:
         - An error message if the command fails or an exception occurs
 
     Notes:
-        - Both stdout and stderr are captured and decoded as text
+        - Both stdout and stderr are streamed in chunks and decoded as text once complete
         - Non-zero return codes result in an error message being returned
         - Any exceptions during execution are caught and returned as error messages
+        - At most MCP_THIS_MAX_CONCURRENCY commands (default: the number of available CPUs)
+          are started at the same time; further calls wait for a slot. This limits the rate
+          of process creation, not the number of commands running, which is unbounded
     """
     try:
-        print(f"Executing command: {cmd}")
-
-        process = await asyncio.create_subprocess_shell(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=None,
+        logger.debug("Executing command: %s", cmd)
+
+        # Limit how many commands are started at once so a burst of tool calls can't fork-storm
+        # the host. The slot is released once the process exists, so a slow or hung command
+        # (e.g. a network call) doesn't stop other tools from running.
+        async with _get_command_semaphore():
+            process = await _spawn(cmd)
+
+        # Drain both pipes concurrently so neither can fill up and block the child
+        stdout_text, stderr_text = await asyncio.gather(
+            _drain(process.stdout),
+            _drain(process.stderr),
         )
-
-        stdout, stderr = await process.communicate()
-
-        stdout_text = stdout.decode() if stdout else ""
-        stderr_text = stderr.decode() if stderr else ""
+        await process.wait()
 
         if process.returncode != 0:
             error_message = stderr_text if stderr_text else "Unknown error"
@@ -213,6 +480,34 @@ def parse_tools(config: dict) -> list[ToolInfo]:
     return tools_info
 
 
+def _parameter_spec(parameters: dict[str, dict]) -> tuple[tuple[str, bool], ...]:
+    """Get `(name, required)` pairs for a tool's parameters, in configuration order."""
+    return tuple(
+        (param_name, bool(param_config.get('required', False)))
+        for param_name, param_config in parameters.items()
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_param_string(param_spec: tuple[tuple[str, bool], ...]) -> str:
+    """
+    Build the parameter string describing a tool's function signature.
+
+    Args:
+        param_spec: `(name, required)` pairs for the tool's parameters, in configuration order.
+
+    Returns:
+        The parameters as they would appear in a function definition.
+        Example: "file_path, lines: str = ''"
+    """
+    # Optional parameters use str with an empty string default
+    # instead of Optional[str] to avoid MCP inspector issues
+    return ", ".join([
+        param_name if required else f"{param_name}: str = ''"
+        for param_name, required in param_spec
+    ])
+
+
 def create_tool_info(tool_name: str, tool_config: dict) -> ToolInfo:
     """
     Create a ToolInfo object from tool configuration.
@@ -225,7 +520,9 @@ def create_tool_info(tool_name: str, tool_config: dict) -> ToolInfo:
         A ToolInfo object.
     """
     # Create a valid Python identifier for the function name
-    function_name = re.sub(r'[^a-zA-Z0-9_]', '_', tool_name)
+    # (names are interned since they are long-lived and used as lookup keys by MCP)
+    tool_name = sys.intern(tool_name)
+    function_name = sys.intern(_NON_IDENT_RE.sub('_', tool_name))
 
     # Get execution configuration
     execution = tool_config['execution']
@@ -236,55 +533,15 @@ def create_tool_info(tool_name: str, tool_config: dict) -> ToolInfo:
     # Get parameters configuration
     parameters = tool_config.get('parameters', {})
 
-    # Save a copy of the command template and parameter names for this specific tool
+    # Save the command template for this specific tool
+    # (parameter names are available from ToolInfo.parameter_names if needed)
     runtime_info = {
         "command_template": command_template,
-        "parameters": list(parameters.keys()),
     }
 
-    # Create parameter string for function definition
-    param_parts = []
-    for param_name, param_config in parameters.items():
-        if param_config.get('required', False):
-            param_parts.append(f"{param_name}")
-        else:
-            # Use str with empty string default for optional parameters
-            # instead of Optional[str] to avoid MCP inspector issues
-            param_parts.append(f"{param_name}: str = ''")
-
-
-    param_string = ", ".join(param_parts)
-
-    # Create a multi-line string for the function definition with explicit indentation
-    # We carefully control where the indentation starts to ensure it works with exec()
-    code_lines = [
-        f"async def {function_name}({param_string}) -> str:",
-        '    """',
-        f'    {description}',
-        '    """',
-        '    # Collect parameters',
-        '    params = {}',
-    ]
-    exec_code = "\n".join(code_lines) + "\n"
-
-    # Add code to collect parameters
-    for param_name in parameters:
-        # Include parameters even if they're empty strings
-        # This handles the case of str = '' default values
-        exec_code += f"    params['{param_name}'] = {param_name}\n"
-
-    # Add code to build and execute the command with consistent indentation
-    command_code_lines = [
-        '    # Get command template from tool_info',
-        '    command_template = tool_info["command_template"]',
-        '    # Build the command',
-        '    cmd = build_command(command_template, params)',
-        '    # Execute the command',
-    ]
-    exec_code += "\n".join(command_code_lines) + "\n"
-
-    # Execute the command with no working directory
-    exec_code += "    return await execute_command(cmd)\n"
+    # Create parameter string describing the tool's function signature
+    # Tools with the same parameter names and requirements share one parameter string
+    param_string = _build_param_string(_parameter_spec(parameters))
 
     # Create a ToolInfo object
     return ToolInfo(
@@ -294,6 +551,66 @@ def create_tool_info(tool_name: str, tool_config: dict) -> ToolInfo:
         description=description,
         parameters=parameters,
         param_string=param_string,
-        exec_code=exec_code,
         runtime_info=runtime_info,
     )
+
+
+@functools.lru_cache(maxsize=1024)
+def _handler_signature(param_spec: tuple[tuple[str, bool], ...]) -> inspect.Signature:
+    """
+    Build the signature of a tool handler.
+
+    Args:
+        param_spec: `(name, required)` pairs for the tool's parameters, in configuration order.
+
+    Returns:
+        The signature MCP uses to build the tool's input schema.
+    """
+    signature_params = []
+    for param_name, required in param_spec:
+        if required:
+            signature_params.append(
+                inspect.Parameter(param_name, inspect.Parameter.POSITIONAL_OR_KEYWORD),
+            )
+        else:
+            # Use str with empty string default for optional parameters
+            # instead of Optional[str] to avoid MCP inspector issues
+            signature_params.append(
+                inspect.Parameter(
+                    param_name,
+                    inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                    default='',
+                    annotation=str,
+                ),
+            )
+    return inspect.Signature(signature_params, return_annotation=str)
+
+
+def create_tool_handler(tool_info: ToolInfo) -> Callable[..., Awaitable[str]]:
+    """
+    Create the async function that MCP calls to run a tool.
+
+    Every tool shares the same function body; the tool's command template is captured in a
+    closure and its parameters are exposed through `__signature__`, which MCP inspects to
+    build the tool's input schema.
+
+    Args:
+        tool_info: The ToolInfo object describing the tool.
+
+    Returns:
+        An async function that builds and executes the tool's command.
+    """
+    command_template = tool_info.runtime_info["command_template"]
+
+    async def handler(**params: str) -> str:
+        # Build the command and execute it with no working directory
+        cmd = build_command(command_template, params)
+        return await execute_command(cmd)
+
+    # Tools with the same parameter names and requirements share one Signature object
+    param_spec = _parameter_spec(tool_info.parameters)
+
+    handler.__name__ = handler.__qualname__ = tool_info.function_name
+    handler.__doc__ = tool_info.description
+    handler.__signature__ = _handler_signature(param_spec)
+    return handler
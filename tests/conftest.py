@@ -0,0 +1,71 @@
+"""Shared fixtures for the test suite."""
+import asyncio
+from collections.abc import AsyncIterator
+import pytest
+import pytest_asyncio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.types import Tool
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """
+    Run the async tests on uvloop if it is installed, like the server does.
+
+    uvloop is optional and not a test dependency; without it the default asyncio event loop is
+    used.
+    """
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def mcp_session(server_params: StdioServerParameters) -> AsyncIterator[ClientSession]:
+    """
+    Start one MCP server for the module and yield an initialized session connected to it.
+
+    The server is started from the module's `server_params` fixture and stays warm for all of
+    the module's tests, so they don't each pay for interpreter startup and server initialization.
+    Tests using it must run on the module's event loop, i.e. be marked with
+    `@pytest.mark.asyncio(loop_scope="module")`, and must not depend on any state another test
+    leaves behind in the server.
+
+    The stdio client must be entered and exited in the same task, so the session runs in a
+    background task that keeps it open until the module's tests are done.
+    """
+    session_ready = asyncio.get_running_loop().create_future()
+    done = asyncio.Event()
+
+    async def run_session() -> None:
+        try:
+            async with stdio_client(server_params) as (read, write), ClientSession(
+                read, write,
+            ) as session:
+                await session.initialize()
+                session_ready.set_result(session)
+                await done.wait()
+        except BaseException as e:
+            if not session_ready.done():
+                session_ready.set_exception(e)
+            raise
+
+    task = asyncio.create_task(run_session())
+    try:
+        yield await session_ready
+    finally:
+        done.set()
+        await task
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def tools_by_name(mcp_session: ClientSession) -> dict[str, Tool]:
+    """List the server's tools once for the module, keyed by tool name."""
+    tools = await mcp_session.list_tools()
+    return {tool.name: tool for tool in tools.tools}
@@ -1,15 +1,28 @@
 """Unit tests for the default configuration tools."""
+import asyncio
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
 import tempfile
 import os
-import shutil
 import re
+import shutil
+import socket
+import threading
 import time
+from pathlib import Path
 from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult, Tool
 
 
-@pytest.fixture
+# The tools shell out to these binaries, so tests that check their output need them installed
+_HAS_TREE = shutil.which("tree") is not None
+_HAS_FIND = shutil.which("find") is not None
+requires_tree = pytest.mark.skipif(not _HAS_TREE, reason="tree is not installed")
+requires_find = pytest.mark.skipif(not _HAS_FIND, reason="find is not installed")
+
+
+@pytest.fixture(scope="module")
 def server_params() -> StdioServerParameters:
     """Create server parameters with default configuration."""
     return StdioServerParameters(
@@ -18,1333 +31,1154 @@ def server_params() -> StdioServerParameters:
     )
 
 
-@pytest.fixture
-def temp_test_directory():
-    """Create a temporary directory with a test structure."""
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
-    try:
-        # Create a test directory structure
-        test_files = [
-            "file1.txt",
-            "file2.py",
-            "subfolder1/file3.txt",
-            "subfolder1/file4.py",
-            "subfolder1/deeper/file5.txt",
-            "subfolder2/file6.py",
-            ".hidden_file",
-            ".hidden_folder/hidden_file.txt",
-        ]
-
-        # Create files
-        for file_path in test_files:
-            full_path = os.path.join(temp_dir, file_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, "w") as f:
-                f.write(f"Content of {file_path}")
-
-        # Create a .gitignore file
-        with open(os.path.join(temp_dir, ".gitignore"), "w") as f:
-            f.write("*.pyc\n")
-            f.write("__pycache__/\n")
-            f.write("subfolder2/\n")  # Ignore subfolder2
-
-        # Create a file that should be ignored by .gitignore
-        ignored_file = os.path.join(temp_dir, "ignored_file.pyc")
-        with open(ignored_file, "w") as f:
-            f.write("This file should be ignored by .gitignore")
-
-        # Create a file in subfolder2 (should be ignored by .gitignore)
-        ignored_by_gitignore = os.path.join(temp_dir, "subfolder2/ignored.txt")
-        with open(ignored_by_gitignore, "w") as f:
-            f.write("This file should be ignored by .gitignore")
+def output_text(result: CallToolResult) -> str:
+    """Check that a tool call returned some content and return its text."""
+    assert result.content
+    return result.content[0].text
+
+
+def output_problems(
+    result: CallToolResult,
+    contains: tuple[str, ...] = (),
+    not_contains: tuple[str, ...] = (),
+) -> list[str]:
+    """
+    Get what is wrong with a tool call's output, without asserting.
+
+    Tests that check a batch of results use this to report every failing case at once.
+
+    Args:
+        result: The result of the tool call.
+        contains: Strings that must appear in the output.
+        not_contains: Strings that must not appear in the output.
+
+    Returns:
+        A description of each problem; empty if the output has no error, contains every string
+        in `contains` and none of the strings in `not_contains`.
+    """
+    text = output_text(result)
+    problems = []
+    if 'Error' in text:
+        problems.append(f"Error in output: {text!r}")
+    missing = [s for s in contains if s not in text]
+    if missing:
+        problems.append(f"Expected in output: {missing}")
+    unexpected = [s for s in not_contains if s in text]
+    if unexpected:
+        problems.append(f"Not expected in output: {unexpected}")
+    return problems
+
+
+def assert_ok(
+    result: CallToolResult,
+    contains: tuple[str, ...] = (),
+    not_contains: tuple[str, ...] = (),
+) -> str:
+    """
+    Check that a tool call returned output without an error and return the output text.
+
+    Args:
+        result: The result of the tool call.
+        contains: Strings that must appear in the output.
+        not_contains: Strings that must not appear in the output.
+    """
+    problems = output_problems(result, contains, not_contains)
+    assert not problems, "; ".join(problems)
+    return output_text(result)
+
+
+async def call_many(
+    session: ClientSession,
+    tool_name: str,
+    arguments: list[dict[str, str]],
+) -> list[CallToolResult]:
+    """
+    Call a tool once per set of arguments, concurrently, on one session.
+
+    The session matches responses to requests by id, so the calls share the server's stdio pipe
+    without waiting on each other.
+
+    Args:
+        session: The session to call the tool on.
+        tool_name: The name of the tool to call.
+        arguments: The arguments for each call.
+
+    Returns:
+        The result of each call, in the order of `arguments`.
+    """
+    return await asyncio.gather(*(session.call_tool(tool_name, args) for args in arguments))
+
+
+# Files in the test directory structure, relative to its root
+TEST_FILES = (
+    "file1.txt",
+    "file2.py",
+    "subfolder1/file3.txt",
+    "subfolder1/file4.py",
+    "subfolder1/deeper/file5.txt",
+    "subfolder2/file6.py",
+    ".hidden_file",
+)
+# Directories in the test directory structure that contain no files
+TEST_EMPTY_DIRS = (".hidden_folder",)
+
+# Memory-backed directory used for test files when MCP_TESTS_TMPFS=1
+TMPFS_DIR = "/dev/shm"
+
+# Top-level files that every listing of the test directory should include
+EXPECTED_PRESENT = ("file1.txt", "file2.py")
+# Files that the test directory's .gitignore excludes
+EXPECTED_GITIGNORED = ("ignored_file.pyc", "subfolder2/ignored.txt")
+
+
+def write_files(files: dict[str, str | bytes]) -> None:
+    """
+    Write each file's content, creating any missing parent directories.
+
+    Each parent directory is created once and each file is written with a single unbuffered
+    write.
+
+    Args:
+        files: Mapping of file path to its text or binary content.
+    """
+    for parent in {os.path.dirname(file_path) for file_path in files}:
+        os.makedirs(parent, exist_ok=True)
+    for file_path, content in files.items():
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content.encode() if isinstance(content, str) else content)
+        finally:
+            os.close(fd)
+
 
+def create_test_tree(root: str) -> None:
+    """Create the test directory structure, including a .gitignore and files it ignores."""
+    contents = {file_path: f"Content of {file_path}" for file_path in TEST_FILES}
+    contents[".gitignore"] = (
+        "*.pyc\n"
+        "__pycache__/\n"
+        "subfolder2/\n"  # Ignore subfolder2
+    )
+    # Files that should be ignored by .gitignore
+    contents["ignored_file.pyc"] = "This file should be ignored by .gitignore"
+    contents["subfolder2/ignored.txt"] = "This file should be ignored by .gitignore"
+
+    for dir_path in TEST_EMPTY_DIRS:
+        os.makedirs(os.path.join(root, dir_path), exist_ok=True)
+    write_files({
+        os.path.join(root, file_path): content for file_path, content in contents.items()
+    })
+
+
+def make_temp_dir() -> str:
+    """
+    Create a temporary directory for test files.
+
+    Set MCP_TESTS_TMPFS=1 to create it in memory-backed /dev/shm, when that exists, so the
+    test files never hit the disk. Otherwise the system's default temporary directory is used.
+    """
+    use_tmpfs = os.environ.get("MCP_TESTS_TMPFS") == "1" and os.path.isdir(TMPFS_DIR)
+    return tempfile.mkdtemp(dir=TMPFS_DIR if use_tmpfs else None)
+
+
+@pytest.fixture(scope="module")
+def shared_test_directory():
+    """
+    Create a temporary directory with the test structure, shared by the tests in the module.
+
+    Only use this in tests that don't add, change or remove files; tests that do should write
+    their own files under pytest's function-scoped tmp_path instead.
+    """
+    temp_dir = make_temp_dir()
+    try:
+        create_test_tree(temp_dir)
         yield temp_dir
     finally:
-        # Clean up
         shutil.rmtree(temp_dir)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestGetDirectoryTree:
     """Test the get-directory-tree tool from the default configuration."""
 
-    async def test_tool_registration(
-        self, server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the get-directory-tree tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "get-directory-tree" in tool_names
-
-            # Get the tool details
-            dir_tree_tool = next(t for t in tools.tools if t.name == "get-directory-tree")
-
-            # Check tool schema has the expected parameters
-            assert "directory" in dir_tree_tool.inputSchema["properties"]
-            assert "custom_excludes" in dir_tree_tool.inputSchema["properties"]
-            assert "format_args" in dir_tree_tool.inputSchema["properties"]
-
-            # Verify only 'directory' is required
-            assert "required" in dir_tree_tool.inputSchema
-            assert "directory" in dir_tree_tool.inputSchema["required"]
-            assert "custom_excludes" not in dir_tree_tool.inputSchema["required"]
-            assert "format_args" not in dir_tree_tool.inputSchema["required"]
+        # Verify tool exists
+        assert "get-directory-tree" in tools_by_name
+
+        # Get the tool details
+        dir_tree_tool = tools_by_name["get-directory-tree"]
+
+        # Check tool schema has the expected parameters
+        assert "directory" in dir_tree_tool.inputSchema["properties"]
+        assert "custom_excludes" in dir_tree_tool.inputSchema["properties"]
+        assert "format_args" in dir_tree_tool.inputSchema["properties"]
 
+        # Verify only 'directory' is required
+        assert "required" in dir_tree_tool.inputSchema
+        assert "directory" in dir_tree_tool.inputSchema["required"]
+        assert "custom_excludes" not in dir_tree_tool.inputSchema["required"]
+        assert "format_args" not in dir_tree_tool.inputSchema["required"]
+
+    @requires_tree
     async def test_basic_directory_tree(
             self,
-            server_params: StdioServerParameters,
-            temp_test_directory: str,
+            mcp_session: ClientSession,
+            shared_test_directory: str,
         ):
         """Test the get-directory-tree tool with basic usage."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with the test directory
-            result = await session.call_tool(
-                "get-directory-tree",
-                {"directory": temp_test_directory},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the result contains expected files and directories
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
-            assert "subfolder1" in result_text
-            assert ".hidden_file" in result_text  # Hidden files are shown with -a
-            assert ".hidden_folder" in result_text
-
-            # Check that gitignore is respected
-            assert "ignored_file.pyc" not in result_text  # Should be ignored by .gitignore
-            assert "subfolder2/ignored.txt" not in result_text  # Should be ignored by .gitignore
-
+        # Call the tool with the test directory
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {"directory": shared_test_directory},
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                *EXPECTED_PRESENT,
+                "subfolder1",
+                ".hidden_file",  # Hidden files are shown with -a
+                ".hidden_folder",
+            ),
+            not_contains=EXPECTED_GITIGNORED,
+        )
+
+    @requires_tree
     async def test_with_custom_excludes(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the get-directory-tree tool with custom excludes."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with custom excludes parameter
-            result = await session.call_tool(
-                "get-directory-tree",
-                {
-                    "directory": temp_test_directory,
-                    # Exclude all .txt files and hidden files/dirs
-                    "custom_excludes": "*.txt|.hidden*",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that .txt files are excluded
-            assert "file1.txt" not in result_text
-            assert "file3.txt" not in result_text
-            assert "file5.txt" not in result_text
-
-            # Check that Python files are still included
-            assert "file2.py" in result_text
-            assert "file4.py" in result_text
-
-            # Check that hidden files are excluded
-            assert ".hidden_file" not in result_text
-            assert ".hidden_folder" not in result_text
-
-            # .gitignore exclusions should still be applied
-            assert "ignored_file.pyc" not in result_text
-            assert "subfolder2" not in result_text
-
+        # Call the tool with custom excludes parameter
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {
+                "directory": shared_test_directory,
+                # Exclude all .txt files and hidden files/dirs
+                "custom_excludes": "*.txt|.hidden*",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "file2.py",
+                "file4.py",
+            ),
+            not_contains=(
+                "file1.txt",
+                "file3.txt",
+                "file5.txt",
+                ".hidden_file",
+                ".hidden_folder",
+                "ignored_file.pyc",
+                "subfolder2",
+            ),
+        )
+
+    @requires_tree
     async def test_with_format_args(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the get-directory-tree tool with format arguments."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with format_args parameter to limit depth
-            result = await session.call_tool(
-                "get-directory-tree",
-                {
-                    "directory": temp_test_directory,
-                    "format_args": "-L 1",  # Limit to depth 1 (no subdirectories contents)
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Root level files should be visible
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
-
-            # Folders should be visible but not their contents
-            assert "subfolder1" in result_text
-
-            # Check that deeper files are not shown due to depth limit
-            assert "file3.txt" not in result_text
-            assert "file4.py" not in result_text
-            assert "file5.txt" not in result_text
-
-            # Check directories-first formatting
-            result2 = await session.call_tool(
-                "get-directory-tree",
-                {
-                    "directory": temp_test_directory,
-                    "format_args": "--dirsfirst",  # List directories before files
-                },
-            )
-            result2_text = result2.content[0].text
-
-            # Check if directories are listed before files
-            # This is harder to test directly, but we can check that the output differs
-            assert result2_text != result_text
-
-            # Check pattern with regex to see if directories appear before files
-            # This regex searches for the first file and directory and checks their order
-            dir_pattern = r"(?:[^\n]*?)subfolder1[^\n]*?\n"
-            file_pattern = r"(?:[^\n]*?)file1\.txt[^\n]*?\n"
-
-            # Find first match position for directory and file
-            dir_match = re.search(dir_pattern, result2_text)
-            file_match = re.search(file_pattern, result2_text)
-
-            # If both patterns are found, check that directory comes before file
-            if dir_match and file_match:
-                assert dir_match.start() < file_match.start()
+        # Call the tool with format_args parameter to limit depth
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {
+                "directory": shared_test_directory,
+                "format_args": "-L 1",  # Limit to depth 1 (no subdirectories contents)
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(*EXPECTED_PRESENT, "subfolder1"),
+            not_contains=(
+                "file3.txt",
+                "file4.py",
+                "file5.txt",
+            ),
+        )
 
     async def test_non_existent_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test the get-directory-tree tool with a non-existent directory."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent directory
-            result = await session.call_tool(
-                "get-directory-tree",
-                {"directory": "/path/that/doesnt/exist"},
-            )
-
-            # Verify we get some content
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert len(result_text) > 0
+        # Call the tool with a non-existent directory
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {"directory": "/path/that/doesnt/exist"},
+        )
 
+        # Verify we get some content
+        assert 'Error' in output_text(result)
+
+    @requires_tree
     async def test_with_all_parameters(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the get-directory-tree tool with all parameters specified."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with all parameters
-            result = await session.call_tool(
-                "get-directory-tree",
-                {
-                    "directory": temp_test_directory,
-                    "custom_excludes": "*.py",  # Exclude Python files
-                    "format_args": "-L 2 --dirsfirst",  # Limit depth and list dirs first
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that Python files are excluded
-            assert "file2.py" not in result_text
-            assert "file4.py" not in result_text
-            assert "file6.py" not in result_text
-
-            # But text files should be included
-            assert "file1.txt" in result_text
-            assert "file3.txt" in result_text
-
-            # Check depth limitation - deeper structure should not be visible
-            assert "deeper" in result_text  # Level 2 folder is visible
-            assert "file5.txt" not in result_text  # Level 3 content is not visible
-
-            # Check if directories are listed before files
-            # Extract just the directory listing part (after the first line)
-            tree_listing = result_text.split("\n", 1)[1] if "\n" in result_text else result_text
-
-            # Find first match position for directory and file in the tree listing
-            dir_pattern = r"(?:[^\n]*?)subfolder1[^\n]*?\n"
-            file_pattern = r"(?:[^\n]*?)file1\.txt[^\n]*?\n"
+        # Call the tool with all parameters
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {
+                "directory": shared_test_directory,
+                "custom_excludes": "*.py",  # Exclude Python files
+                "format_args": "-L 2 --dirsfirst",  # Limit depth and list dirs first
+            },
+        )
+
+        result_text = assert_ok(
+            result,
+            contains=(
+                "file1.txt",
+                "file3.txt",
+                "deeper",  # Level 2 folder is visible
+            ),
+            not_contains=(
+                "file2.py",
+                "file4.py",
+                "file6.py",
+                "file5.txt",  # Level 3 content is not visible
+            ),
+        )
+
+        # Check if directories are listed before files
+        # Extract just the directory listing part (after the first line)
+        tree_listing = result_text.split("\n", 1)[1] if "\n" in result_text else result_text
+
+        # Find first position of directory and file in the tree listing
+        dir_index = tree_listing.find("subfolder1")
+        file_index = tree_listing.find("file1.txt")
+
+        # If both are found, check that directory comes before file
+        if dir_index != -1 and file_index != -1:
+            assert dir_index < file_index
+
+    @requires_tree
+    async def test_directory_with_spaces(
+        self,
+        mcp_session: ClientSession,
+        tmp_path: Path,
+    ):
+        """Test the get-directory-tree tool with a directory path containing spaces."""
+        # Create a directory with spaces in the name and a simple file structure
+        dir_with_spaces = tmp_path / "test dir with spaces"
+        dir_with_spaces.mkdir()
+        (dir_with_spaces / "test file.txt").write_text("Test content")
+
+        # Create a subfolder with spaces
+        subfolder = dir_with_spaces / "sub folder"
+        subfolder.mkdir()
+        (subfolder / "nested file.txt").write_text("Nested content")
+
+        # Call the tool with the directory containing spaces
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {"directory": str(dir_with_spaces)},
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "test file.txt",
+                "sub folder",
+                "nested file.txt",
+            ),
+        )
+
+    @requires_tree
+    async def test_empty_directory(self, mcp_session: ClientSession, tmp_path: Path):
+        """Test the get-directory-tree tool with an empty directory."""
+        # Create an empty directory
+        empty_dir = tmp_path / "empty_dir"
+        empty_dir.mkdir()
 
-            dir_match = re.search(dir_pattern, tree_listing)
-            file_match = re.search(file_pattern, tree_listing)
+        # Call the tool with the empty directory
+        result = await mcp_session.call_tool(
+            "get-directory-tree",
+            {"directory": str(empty_dir)},
+        )
 
-            # If both patterns are found, check that directory comes before file
-            if dir_match and file_match:
-                assert dir_match.start() < file_match.start()
+        result_text = assert_ok(result)
 
-    async def test_directory_with_spaces(self, server_params: StdioServerParameters):
-        """Test the get-directory-tree tool with a directory path containing spaces."""
-        # Create a temporary directory with spaces in the name
-        temp_dir_with_spaces = tempfile.mkdtemp(prefix="test dir with spaces ")
-        try:
-            # Create a simple file structure
-            test_file = os.path.join(temp_dir_with_spaces, "test file.txt")
-            with open(test_file, "w") as f:  # noqa: ASYNC230
-                f.write("Test content")
-
-            # Create a subfolder with spaces
-            subfolder = os.path.join(temp_dir_with_spaces, "sub folder")
-            os.makedirs(subfolder, exist_ok=True)
-            with open(os.path.join(subfolder, "nested file.txt"), "w") as f:  # noqa: ASYNC230
-                f.write("Nested content")
-
-            async with stdio_client(server_params) as (read, write), ClientSession(
-                read, write,
-            ) as session:
-                await session.initialize()
-
-                # Call the tool with the directory containing spaces
-                result = await session.call_tool(
-                    "get-directory-tree",
-                    {"directory": temp_dir_with_spaces},
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-                assert 'Error' not in result_text
-
-                # Check that files and folders with spaces are shown correctly
-                assert "test file.txt" in result_text
-                assert "sub folder" in result_text
-                assert "nested file.txt" in result_text
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir_with_spaces)
+        # The output should show the directory with no contents (just a few lines)
+        line_count = len(result_text.strip().split("\n"))
+        assert 1 <= line_count <= 5, (
+            f"Expected 1-5 lines for empty directory, got {line_count}"
+        )
 
-    async def test_empty_directory(self, server_params: StdioServerParameters):
-        """Test the get-directory-tree tool with an empty directory."""
-        # Create an empty temporary directory
-        empty_dir = tempfile.mkdtemp()
-        try:
-            async with stdio_client(server_params) as (read, write), ClientSession(
-                read, write,
-            ) as session:
-                await session.initialize()
-
-                # Call the tool with the empty directory
-                result = await session.call_tool(
-                    "get-directory-tree",
-                    {"directory": empty_dir},
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-                assert 'Error' not in result_text
-
-                # The output should show the directory with no contents (just a few lines)
-                line_count = len(result_text.strip().split("\n"))
-                assert 1 <= line_count <= 5, (
-                    f"Expected 1-5 lines for empty directory, got {line_count}"
-                )
-
-                # The directory name should be in the output
-                dir_name = os.path.basename(empty_dir)
-                assert dir_name in result_text
-        finally:
-            # Clean up
-            shutil.rmtree(empty_dir)
+        # The directory name should be in the output
+        assert empty_dir.name in result_text
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestFindFiles:
     """Test the find-files tool from the default configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the find-files tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "find-files" in tool_names
-
-            # Get the tool details
-            find_files_tool = next(t for t in tools.tools if t.name == "find-files")
-
-            # Check tool schema has the expected parameters
-            assert "directory" in find_files_tool.inputSchema["properties"]
-            assert "arguments" in find_files_tool.inputSchema["properties"]
-            assert "exclude_paths" in find_files_tool.inputSchema["properties"]
-            assert "exclude_files" in find_files_tool.inputSchema["properties"]
-
-            # Verify only 'directory' is required
-            assert "required" in find_files_tool.inputSchema
-            assert "directory" in find_files_tool.inputSchema["required"]
-            assert "arguments" not in find_files_tool.inputSchema["required"]
-            assert "exclude_paths" not in find_files_tool.inputSchema["required"]
-            assert "exclude_files" not in find_files_tool.inputSchema["required"]
-
+        # Verify tool exists
+        assert "find-files" in tools_by_name
+
+        # Get the tool details
+        find_files_tool = tools_by_name["find-files"]
+
+        # Check tool schema has the expected parameters
+        assert "directory" in find_files_tool.inputSchema["properties"]
+        assert "arguments" in find_files_tool.inputSchema["properties"]
+        assert "exclude_paths" in find_files_tool.inputSchema["properties"]
+        assert "exclude_files" in find_files_tool.inputSchema["properties"]
+
+        # Verify only 'directory' is required
+        assert "required" in find_files_tool.inputSchema
+        assert "directory" in find_files_tool.inputSchema["required"]
+        assert "arguments" not in find_files_tool.inputSchema["required"]
+        assert "exclude_paths" not in find_files_tool.inputSchema["required"]
+        assert "exclude_files" not in find_files_tool.inputSchema["required"]
+
+    @requires_find
     async def test_basic_file_finding(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the find-files tool with basic usage."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with the test directory to find all files
-            result = await session.call_tool(
-                "find-files",
-                {"directory": temp_test_directory},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the result contains expected files
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
-            assert "subfolder1/file3.txt" in result_text
-            assert "subfolder1/file4.py" in result_text
-
-            # Check that hidden files are also found
-            assert ".hidden_file" in result_text
-
-    async def test_find_by_extension(
+        # Call the tool with the test directory to find all files
+        result = await mcp_session.call_tool(
+            "find-files",
+            {"directory": shared_test_directory},
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                *EXPECTED_PRESENT,
+                "subfolder1/file3.txt",
+                "subfolder1/file4.py",
+                ".hidden_file",
+            ),
+        )
+
+    @requires_find
+    async def test_find_with_filters(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
-        """Test the find-files tool with specific file extension filter."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find only Python files
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "arguments": "-name '*.py'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only Python files are found
-            assert "file2.py" in result_text
-            assert "subfolder1/file4.py" in result_text
-
-            # Check that non-Python files are not in the results
-            assert "file1.txt" not in result_text
-            assert "subfolder1/file3.txt" not in result_text
-            assert ".hidden_file" not in result_text
+        """
+        Test find-files with several independent filters, run concurrently on one session.
 
+        Every result is checked, and all failing cases are reported together by id.
+        """
+        # Case id: (arguments, strings expected in the output, strings not expected in it)
+        cases = {
+            "python-files": (
+                "-name '*.py'",
+                ("file2.py", "subfolder1/file4.py"),
+                ("file1.txt", "subfolder1/file3.txt", ".hidden_file"),
+            ),
+            "python-files-outside-subfolder1": (
+                "-name '*.py' -not -path '*/subfolder1/*'",
+                ("file2.py",),
+                ("subfolder1/file4.py",),
+            ),
+            # Arguments that should match no files
+            "no-matches": (
+                "-name 'doesnt-exist-*.xyz'",
+                (),
+                (*TEST_FILES, *EXPECTED_GITIGNORED),
+            ),
+            # All files, to check that .gitignore is respected
+            "gitignore": ("", EXPECTED_PRESENT, EXPECTED_GITIGNORED),
+        }
+
+        results = await call_many(
+            mcp_session,
+            "find-files",
+            [
+                {"directory": shared_test_directory, "arguments": arguments}
+                for arguments, _, _ in cases.values()
+            ],
+        )
+
+        failures = {
+            case_id: problems
+            for (case_id, (_, contains, not_contains)), result in zip(cases.items(), results)
+            if (problems := output_problems(result, contains, not_contains))
+        }
+        assert not failures, f"Failing find-files cases: {failures}"
+
+    @requires_find
     async def test_find_newer_files(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
+        tmp_path: Path,
     ):
         """Test the find-files tool with timestamp filter."""
-        # Create a temporary directory
-        temp_dir = tempfile.mkdtemp()
-        try:
-            # Create an old file (modify time set to 2 days ago)
-            old_file = os.path.join(temp_dir, "old_file.txt")
-            with open(old_file, "w") as f:  # noqa: ASYNC230
-                f.write("Old content")
-
-            # Set its modification time to 2 days ago
-            old_time = time.time() - (2 * 24 * 60 * 60)
-            os.utime(old_file, (old_time, old_time))
-
-            # Create a new file
-            new_file = os.path.join(temp_dir, "new_file.txt")
-            with open(new_file, "w") as f:  # noqa: ASYNC230
-                f.write("New content")
-
-            async with stdio_client(server_params) as (read, write), ClientSession(
-                read, write,
-            ) as session:
-                await session.initialize()
-
-                # Call the tool to find files newer than 1 day
-                result = await session.call_tool(
-                    "find-files",
-                    {
-                        "directory": temp_dir,
-                        "arguments": "-mtime -1",
-                    },
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-                assert 'Error' not in result_text
-
-                # Check that only the new file is found
-                assert "new_file.txt" in result_text
-                assert "old_file.txt" not in result_text
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir)
-
+        # Create an old file (modify time set to 2 days ago)
+        old_file = tmp_path / "old_file.txt"
+        old_file.write_text("Old content")
+
+        # Set its access and modification times to 2 days ago
+        old_time_ns = time.time_ns() - 2 * 24 * 60 * 60 * 10**9
+        os.utime(old_file, ns=(old_time_ns, old_time_ns))
+
+        # Create a new (empty) file, whose modification time is now
+        (tmp_path / "new_file.txt").touch()
+
+        # Call the tool to find files newer than 1 day
+        result = await mcp_session.call_tool(
+            "find-files",
+            {
+                "directory": str(tmp_path),
+                "arguments": "-mtime -1",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("new_file.txt",),
+            not_contains=("old_file.txt",),
+        )
+
+    @requires_find
     async def test_find_by_size(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
+        tmp_path: Path,
     ):
         """Test the find-files tool with size filter."""
-        # Create a temporary directory
-        temp_dir = tempfile.mkdtemp()
-        try:
-            # Create a small file (less than 10 bytes)
-            small_file = os.path.join(temp_dir, "small_file.txt")
-            with open(small_file, "w") as f:  # noqa: ASYNC230
-                f.write("Small")
-
-            # Create a larger file (more than 10 bytes)
-            large_file = os.path.join(temp_dir, "large_file.txt")
-            with open(large_file, "w") as f:  # noqa: ASYNC230
-                f.write("This is a larger file with more than 10 bytes of content")
-
-            async with stdio_client(server_params) as (read, write), ClientSession(
-                read, write,
-            ) as session:
-                await session.initialize()
-
-                # Call the tool to find files larger than 10 bytes
-                result = await session.call_tool(
-                    "find-files",
-                    {
-                        "directory": temp_dir,
-                        "arguments": "-size +10c",
-                    },
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-                assert 'Error' not in result_text
-
-                # Check that only the large file is found
-                assert "large_file.txt" in result_text
-                assert "small_file.txt" not in result_text
-        finally:
-            # Clean up
-            shutil.rmtree(temp_dir)
-
-    async def test_complex_find_arguments(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test the find-files tool with complex arguments combining multiple conditions."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with complex arguments
-            # (Python files not in subfolder1)
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "arguments": "-name '*.py' -not -path '*/subfolder1/*'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only Python files not in subfolder1 are found
-            assert "file2.py" in result_text
-            assert "subfolder1/file4.py" not in result_text
+        # Create a small file (less than 10 bytes)
+        (tmp_path / "small_file.txt").write_text("Small")
+
+        # Create a larger file (more than 10 bytes)
+        (tmp_path / "large_file.txt").write_text(
+            "This is a larger file with more than 10 bytes of content",
+        )
+
+        # Call the tool to find files larger than 10 bytes
+        result = await mcp_session.call_tool(
+            "find-files",
+            {
+                "directory": str(tmp_path),
+                "arguments": "-size +10c",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("large_file.txt",),
+            not_contains=("small_file.txt",),
+        )
 
     async def test_non_existent_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test the find-files tool with a non-existent directory."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent directory
-            result = await session.call_tool(
-                "find-files",
-                {"directory": "/path/that/doesnt/exist"},
-            )
-
-            # Verify we get some content (likely an error message)
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Just check that we received some output
-            assert len(result_text) > 0
-
-    async def test_empty_results(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test the find-files tool with arguments that yield no results."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with arguments that should match no files
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "arguments": "-name 'doesnt-exist-*.xyz'",
-                },
-            )
+        # Call the tool with a non-existent directory
+        result = await mcp_session.call_tool(
+            "find-files",
+            {"directory": "/path/that/doesnt/exist"},
+        )
 
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        # Verify we get some content (likely an error message)
+        result_text = assert_ok(result)
 
-            # Check that the result is empty (or contains a message about no results)
-            assert result_text.strip() == "" or "No such file or directory" in result_text
-
-    async def test_gitignore_support(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test that find-files respects .gitignore files."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find all files
-            result = await session.call_tool(
-                "find-files",
-                {"directory": temp_test_directory},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Files ignored by .gitignore should not appear
-            assert "ignored_file.pyc" not in result_text  # *.pyc pattern
-            assert "subfolder2/ignored.txt" not in result_text  # subfolder2/ pattern
-
-            # Regular files should still appear
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
+        # Just check that we received some output
+        assert len(result_text) > 0
 
+    @requires_find
     async def test_basic_exclusions(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test that find-files excludes basic hardcoded patterns."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find all files
-            result = await session.call_tool(
-                "find-files",
-                {"directory": temp_test_directory},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Files matching hardcoded exclusions should not appear
-            assert "ignored_file.pyc" not in result_text  # *.pyc exclusion
-            assert "__pycache__" not in result_text  # __pycache__ exclusion
-
-            # Regular files should still appear
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
-
+        # Call the tool to find all files
+        result = await mcp_session.call_tool(
+            "find-files",
+            {"directory": shared_test_directory},
+        )
+
+        assert_ok(
+            result,
+            contains=EXPECTED_PRESENT,
+            not_contains=(
+                "ignored_file.pyc",  # *.pyc exclusion
+                "__pycache__",  # __pycache__ exclusion
+            ),
+        )
+
+    @requires_find
     async def test_exclude_paths_parameter(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the find-files tool with exclude_paths parameter."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with path exclusions
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "exclude_paths": "./subfolder1/*",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Files in subfolder1 should be excluded
-            assert "subfolder1/file3.txt" not in result_text
-            assert "subfolder1/file4.py" not in result_text
-
-            # Root level files should still appear
-            assert "file1.txt" in result_text
-            assert "file2.py" in result_text
-
+        # Call the tool with path exclusions
+        result = await mcp_session.call_tool(
+            "find-files",
+            {
+                "directory": shared_test_directory,
+                "exclude_paths": "./subfolder1/*",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=EXPECTED_PRESENT,
+            not_contains=(
+                "subfolder1/file3.txt",
+                "subfolder1/file4.py",
+            ),
+        )
+
+    @requires_find
     async def test_exclude_files_parameter(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the find-files tool with exclude_files parameter."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with file exclusions
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "exclude_files": "*.txt",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # .txt files should be excluded
-            assert "file1.txt" not in result_text
-            assert "subfolder1/file3.txt" not in result_text
-
-            # .py files should still appear
-            assert "file2.py" in result_text
-            assert "subfolder1/file4.py" in result_text
-
+        # Call the tool with file exclusions
+        result = await mcp_session.call_tool(
+            "find-files",
+            {
+                "directory": shared_test_directory,
+                "exclude_files": "*.txt",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "file2.py",
+                "subfolder1/file4.py",
+            ),
+            not_contains=(
+                "file1.txt",
+                "subfolder1/file3.txt",
+            ),
+        )
+
+    @requires_find
     async def test_multiple_excludes(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        shared_test_directory: str,
     ):
         """Test the find-files tool with multiple exclude patterns."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with multiple exclusions
-            result = await session.call_tool(
-                "find-files",
-                {
-                    "directory": temp_test_directory,
-                    "exclude_paths": "./subfolder1/*|./.hidden_folder/*",
-                    "exclude_files": "*.txt|.hidden*",
-                },
-            )
+        # Call the tool with multiple exclusions
+        result = await mcp_session.call_tool(
+            "find-files",
+            {
+                "directory": shared_test_directory,
+                "exclude_paths": "./subfolder1/*|./.hidden_folder/*",
+                "exclude_files": "*.txt|.hidden*",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("file2.py",),
+            not_contains=(
+                "subfolder1/file3.txt",  # path exclusion
+                "subfolder1/file4.py",  # path exclusion
+                ".hidden_file",  # file exclusion
+                "file1.txt",  # file exclusion
+            ),
+        )
+
+
+# Files for the text search and extraction tests, keyed by the directory each test uses
+TEXT_CORPUS: dict[str, dict[str, bytes]] = {
+    "basic_text_search": {
+        "test_search1.txt": (
+            b"This is a test file with the keyword apple.\n"
+            b"Another line without the keyword."
+        ),
+        "test_search2.txt": (
+            b"This file has multiple apple mentions.\n"
+            b"Here is another apple on a new line."
+        ),
+        "test_search3.py": (
+            b"def test_function():\n"
+            b"    # This is a Python file with apple mentioned\n"
+            b"    return 'apple'"
+        ),
+    },
+    "pattern_with_regex": {
+        "regex_test.py": b"""
+import os
+import sys
+import numpy as np
+import pandas as pd
+from datetime import datetime
 
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+def function1():
+    pass
 
-            # Files matching exclude patterns should not appear
-            assert "subfolder1/file3.txt" not in result_text  # path exclusion
-            assert "subfolder1/file4.py" not in result_text  # path exclusion
-            assert ".hidden_file" not in result_text  # file exclusion
-            assert ".hidden_folder/hidden_file.txt" not in result_text  # path exclusion
-            assert "file1.txt" not in result_text  # file exclusion
+def function2(arg1, arg2=None):
+    return arg1 + arg2
 
-            # Only Python files not in excluded paths should appear
-            assert "file2.py" in result_text
+class TestClass:
+    def method1(self):
+        return "test"
+""",
+    },
+    "search_with_context": {
+        "context_test.txt": b"""Line 1
+Line 2
+Line 3 with search term
+Line 4
+Line 5
+Line 6 with another search term
+Line 7
+Line 8
+""",
+    },
+    "search_with_file_filter": {
+        "filter_test.py": b"This file contains the search pattern example",
+        "filter_test.txt": b"This file contains the search pattern example",
+        "filter_test.js": b"This file contains the search pattern example",
+    },
+    "case_insensitive_search": {
+        "case_test.txt": b"""This has ERROR in uppercase.
+This has error in lowercase.
+This has Error with mixed case.
+""",
+    },
+    "non_existent_pattern": {
+        "no_match.txt": b"This file does not contain the search term.",
+    },
+    "search_with_line_numbers": {
+        "line_numbers.txt": b"""Line 1 no match
+Line 2 has the pattern
+Line 3 no match
+Line 4 has the pattern again
+Line 5 no match
+""",
+    },
+    # Shared by the exclude_paths and exclude_files tests
+    "excludes": dict.fromkeys(
+        (
+            "root_file.py",
+            "root_file.txt",
+            "subfolder1/sub_file.py",
+            "subfolder1/sub_file.txt",
+        ),
+        b"search for this pattern",
+    ),
+    "gitignore_pattern": {
+        "config_info.txt": b"""Configuration files:
+Line before gitignore mention
+The .gitignore file controls what files are ignored
+Line after gitignore mention
+Another line after
+Final line
+""",
+    },
+    "basic_file_extraction": {
+        "extract_test.txt": b"""Line 1: Test content
+Line 2: More content
+Line 3: Final content""",
+    },
+    "extract_specific_lines": {
+        "multi_line.txt": b"\n".join(b"Line %d" % i for i in range(1, 11)),
+    },
+    "extract_with_filtering": {
+        "mixed_content.txt": b"""INFO: System started
+DEBUG: Initializing components
+ERROR: Failed to connect to database
+INFO: Retrying connection
+DEBUG: Connection parameters
+ERROR: Connection timeout
+INFO: Shutdown initiated""",
+    },
+    "json_formatting": {
+        "test.json": b'{"name":"Test","values":[1,2,3],"nested":{"key":"value"}}',
+    },
+    "extract_binary_file": {
+        "binary.bin": bytes([0x00, 0x01, 0x02, 0x03, 0xFF, 0xFE, 0xFD, 0xFC]),
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def text_corpus() -> Iterator[dict[str, str]]:
+    """
+    Write the files in TEXT_CORPUS once for the module.
+
+    Tests only read these files, so they share them instead of each writing their own.
+
+    Yields:
+        Mapping of each TEXT_CORPUS key to the directory holding its files.
+    """
+    root = make_temp_dir()
+    try:
+        write_files({
+            os.path.join(root, name, file_path): content
+            for name, files in TEXT_CORPUS.items()
+            for file_path, content in files.items()
+        })
+        yield {name: os.path.join(root, name) for name in TEXT_CORPUS}
+    finally:
+        shutil.rmtree(root)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestFindTextPatterns:
     """Test the find-text-patterns tool from the default configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the find-text-patterns tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "find-text-patterns" in tool_names
-
-            # Get the tool details
-            find_text_patterns_tool = next(
-                t for t in tools.tools if t.name == "find-text-patterns"
-            )
-
-            # Check tool schema has the expected parameters
-            assert "pattern" in find_text_patterns_tool.inputSchema["properties"]
-            assert "arguments" in find_text_patterns_tool.inputSchema["properties"]
-            assert "directory" in find_text_patterns_tool.inputSchema["properties"]
-            assert "exclude_paths" in find_text_patterns_tool.inputSchema["properties"]
-            assert "exclude_files" in find_text_patterns_tool.inputSchema["properties"]
-
-            # Verify both 'pattern' and 'directory' are required
-            assert "required" in find_text_patterns_tool.inputSchema
-            assert "pattern" in find_text_patterns_tool.inputSchema["required"]
-            assert "directory" in find_text_patterns_tool.inputSchema["required"]
-            assert "arguments" not in find_text_patterns_tool.inputSchema["required"]
-            assert "exclude_paths" not in find_text_patterns_tool.inputSchema["required"]
-            assert "exclude_files" not in find_text_patterns_tool.inputSchema["required"]
+        # Verify tool exists
+        assert "find-text-patterns" in tools_by_name
+
+        # Get the tool details
+        find_text_patterns_tool = tools_by_name["find-text-patterns"]
+
+        # Check tool schema has the expected parameters
+        assert "pattern" in find_text_patterns_tool.inputSchema["properties"]
+        assert "arguments" in find_text_patterns_tool.inputSchema["properties"]
+        assert "directory" in find_text_patterns_tool.inputSchema["properties"]
+        assert "exclude_paths" in find_text_patterns_tool.inputSchema["properties"]
+        assert "exclude_files" in find_text_patterns_tool.inputSchema["properties"]
+
+        # Verify both 'pattern' and 'directory' are required
+        assert "required" in find_text_patterns_tool.inputSchema
+        assert "pattern" in find_text_patterns_tool.inputSchema["required"]
+        assert "directory" in find_text_patterns_tool.inputSchema["required"]
+        assert "arguments" not in find_text_patterns_tool.inputSchema["required"]
+        assert "exclude_paths" not in find_text_patterns_tool.inputSchema["required"]
+        assert "exclude_files" not in find_text_patterns_tool.inputSchema["required"]
 
     async def test_basic_text_search(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with basic text search."""
-        # Create test files with specific content
-        test_file1 = os.path.join(temp_test_directory, "test_search1.txt")
-        test_file2 = os.path.join(temp_test_directory, "test_search2.txt")
-        test_file3 = os.path.join(temp_test_directory, "test_search3.py")
-
-        with open(test_file1, "w") as f:  # noqa: ASYNC230
-            f.write("This is a test file with the keyword apple.\n"
-                    "Another line without the keyword.")
-
-        with open(test_file2, "w") as f:  # noqa: ASYNC230
-            f.write("This file has multiple apple mentions.\nHere is another apple on a new line.")
-
-        with open(test_file3, "w") as f:  # noqa: ASYNC230
-            f.write("def test_function():\n    # This is a Python file with apple mentioned\n    return 'apple'")  # noqa: E501
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find the pattern
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "apple",
-                    "directory": temp_test_directory,
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that matches are found in all three files
-            assert "test_search1.txt" in result_text
-            assert "test_search2.txt" in result_text
-            assert "test_search3.py" in result_text
-
-            # Check that the correct lines are found
-            assert "keyword apple" in result_text
-            assert "multiple apple mentions" in result_text
-            assert "return 'apple'" in result_text
+        test_dir = text_corpus["basic_text_search"]
+
+        # Call the tool to find the pattern
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "apple",
+                "directory": test_dir,
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "test_search1.txt",
+                "test_search2.txt",
+                "test_search3.py",
+                "keyword apple",
+                "multiple apple mentions",
+                "return 'apple'",
+            ),
+        )
 
     async def test_pattern_with_regex(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with regex patterns."""
-        # Create test files with specific content
-        python_file = os.path.join(temp_test_directory, "regex_test.py")
-        with open(python_file, "w") as f:  # noqa: ASYNC230
-            f.write("""
-import os
-import sys
-import numpy as np
-import pandas as pd
-from datetime import datetime
-
-def function1():
-    pass
-
-def function2(arg1, arg2=None):
-    return arg1 + arg2
-
-class TestClass:
-    def method1(self):
-        return "test"
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find import statements with regex
-            result = await session.call_tool(
-                "find-text-patterns",
+        test_dir = text_corpus["pattern_with_regex"]
+        test_name = "regex_test.py"
+
+        result, result2 = await call_many(
+            mcp_session,
+            "find-text-patterns",
+            [
+                # Call the tool to find import statements with regex
                 {
                     "pattern": "import.*",
-                    "directory": os.path.dirname(python_file),
-                    "arguments": f"--include='{os.path.basename(python_file)}'",
+                    "directory": test_dir,
+                    "arguments": f"--include='{test_name}'",
                 },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that all import statements are found
-            assert "import os" in result_text
-            assert "import sys" in result_text
-            assert "import numpy" in result_text
-            assert "import pandas" in result_text
-
-            # Call the tool to find function definitions with regex
-            result2 = await session.call_tool(
-                "find-text-patterns",
+                # Call the tool to find function definitions with regex
                 {
                     "pattern": "def function[0-9]",
-                    "directory": os.path.dirname(python_file),
-                    "arguments": f"--include='{os.path.basename(python_file)}'",
+                    "directory": test_dir,
+                    "arguments": f"--include='{test_name}'",
                 },
-            )
-
-            # Verify we got some output
-            assert result2.content
-            result2_text = result2.content[0].text
-
-            # Check that function definitions are found
-            assert "def function1" in result2_text
-            assert "def function2" in result2_text
+            ],
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "import os",
+                "import sys",
+                "import numpy",
+                "import pandas",
+            ),
+        )
+
+        # Verify we got some output
+        result2_text = output_text(result2)
+
+        # Check that function definitions are found
+        assert "def function1" in result2_text
+        assert "def function2" in result2_text
 
     async def test_search_with_context(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with context lines."""
-        # Create a test file with specific content
-        test_file = os.path.join(temp_test_directory, "context_test.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""Line 1
-Line 2
-Line 3 with search term
-Line 4
-Line 5
-Line 6 with another search term
-Line 7
-Line 8
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to find pattern with context (1 line before, 2 lines after)
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "search term",
-                    "directory": os.path.dirname(test_file),
-                    "arguments": f"-B 1 -A 2 --include='{os.path.basename(test_file)}'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that context lines are included
-            # For first match
-            assert "Line 2" in result_text  # 1 line before
-            assert "Line 3 with search term" in result_text  # match
-            assert "Line 4" in result_text  # 1 line after
-            assert "Line 5" in result_text  # 2 lines after
-
-            # For second match
-            assert "Line 5" in result_text  # 1 line before
-            assert "Line 6 with another search term" in result_text  # match
-            assert "Line 7" in result_text  # 1 line after
-            assert "Line 8" in result_text  # 2 lines after
+        test_dir = text_corpus["search_with_context"]
+        test_name = "context_test.txt"
+
+        # Call the tool to find pattern with context (1 line before, 2 lines after)
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "search term",
+                "directory": test_dir,
+                "arguments": f"-B 1 -A 2 --include='{test_name}'",
+            },
+        )
+
+        # Check that both matches are found with their context lines
+        assert_ok(
+            result,
+            contains=(
+                "Line 2",  # 1 line before the first match
+                "Line 3 with search term",  # match
+                "Line 4",  # 1 line after
+                "Line 5",  # 2 lines after, and 1 line before the second match
+                "Line 6 with another search term",  # match
+                "Line 7",  # 1 line after
+                "Line 8",  # 2 lines after
+            ),
+        )
 
     async def test_search_with_file_filter(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with file type filtering."""
-        # Create test files with different extensions but same content
-        py_file = os.path.join(temp_test_directory, "filter_test.py")
-        txt_file = os.path.join(temp_test_directory, "filter_test.txt")
-        js_file = os.path.join(temp_test_directory, "filter_test.js")
-
-        file_content = "This file contains the search pattern example"
-
-        for file_path in [py_file, txt_file, js_file]:
-            with open(file_path, "w") as f:  # noqa: ASYNC230
-                f.write(file_content)
+        test_dir = text_corpus["search_with_file_filter"]
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to search only in Python files
-            result = await session.call_tool(
-                "find-text-patterns",
+        result, result2 = await call_many(
+            mcp_session,
+            "find-text-patterns",
+            [
+                # Call the tool to search only in Python files
                 {
                     "pattern": "search pattern",
-                    "directory": temp_test_directory,
+                    "directory": test_dir,
                     "arguments": "--include='*.py'",
                 },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only Python file is included
-            assert "filter_test.py" in result_text
-            assert "filter_test.txt" not in result_text
-            assert "filter_test.js" not in result_text
-
-            # Call the tool to search in both Python and JavaScript files
-            result2 = await session.call_tool(
-                "find-text-patterns",
+                # Call the tool to search in both Python and JavaScript files
                 {
                     "pattern": "search pattern",
-                    "directory": temp_test_directory,
+                    "directory": test_dir,
                     "arguments": "--include='*.py' --include='*.js'",
                 },
-            )
-
-            # Verify we got some output
-            assert result2.content
-            result2_text = result2.content[0].text
-
-            # Check that both Python and JavaScript files are included
-            assert "filter_test.py" in result2_text
-            assert "filter_test.js" in result2_text
-            assert "filter_test.txt" not in result2_text
+            ],
+        )
+
+        assert_ok(
+            result,
+            contains=("filter_test.py",),
+            not_contains=(
+                "filter_test.txt",
+                "filter_test.js",
+            ),
+        )
+
+        # Verify we got some output
+        result2_text = output_text(result2)
+
+        # Check that both Python and JavaScript files are included
+        assert "filter_test.py" in result2_text
+        assert "filter_test.js" in result2_text
+        assert "filter_test.txt" not in result2_text
 
     async def test_case_insensitive_search(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with case-insensitive search."""
-        # Create a test file with mixed case
-        test_file = os.path.join(temp_test_directory, "case_test.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""This has ERROR in uppercase.
-This has error in lowercase.
-This has Error with mixed case.
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with case-sensitive search (default)
-            result = await session.call_tool(
-                "find-text-patterns",
+        test_dir = text_corpus["case_insensitive_search"]
+        test_name = "case_test.txt"
+
+        result, result2 = await call_many(
+            mcp_session,
+            "find-text-patterns",
+            [
+                # Call the tool with case-sensitive search (default)
                 {
                     "pattern": "error",
-                    "directory": os.path.dirname(test_file),
-                    "arguments": f"--include='{os.path.basename(test_file)}'",
+                    "directory": test_dir,
+                    "arguments": f"--include='{test_name}'",
                 },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only exact case match is found
-            assert "lowercase" in result_text
-            assert "uppercase" not in result_text
-            assert "mixed case" not in result_text
-
-            # Call the tool with case-insensitive search
-            result2 = await session.call_tool(
-                "find-text-patterns",
+                # Call the tool with case-insensitive search
                 {
                     "pattern": "error",
-                    "directory": os.path.dirname(test_file),
-                    "arguments": f"-i --include='{os.path.basename(test_file)}'",
+                    "directory": test_dir,
+                    "arguments": f"-i --include='{test_name}'",
                 },
-            )
-
-            # Verify we got some output
-            assert result2.content
-            result2_text = result2.content[0].text
-
-            # Check that all variations are found
-            assert "lowercase" in result2_text
-            assert "uppercase" in result2_text
-            assert "mixed case" in result2_text
+            ],
+        )
+
+        assert_ok(
+            result,
+            contains=("lowercase",),
+            not_contains=(
+                "uppercase",
+                "mixed case",
+            ),
+        )
+
+        # Verify we got some output
+        result2_text = output_text(result2)
+
+        # Check that all variations are found
+        assert "lowercase" in result2_text
+        assert "uppercase" in result2_text
+        assert "mixed case" in result2_text
 
     async def test_non_existent_pattern(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with a pattern that doesn't exist."""
-        # Create a test file
-        test_file = os.path.join(temp_test_directory, "no_match.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("This file does not contain the search term.")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a pattern not in the file
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "nonexistentpattern",
-                    "directory": os.path.dirname(test_file),
-                    "arguments": f"--include='{os.path.basename(test_file)}'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert isinstance(result_text, str)
+        test_dir = text_corpus["non_existent_pattern"]
+        test_name = "no_match.txt"
+
+        # Call the tool with a pattern not in the file
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "nonexistentpattern",
+                "directory": test_dir,
+                "arguments": f"--include='{test_name}'",
+            },
+        )
+
+        # Verify we got some output
+        assert 'Error' in output_text(result)
 
     async def test_search_with_line_numbers(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool showing line numbers."""
-        # Create a test file with line numbers
-        test_file = os.path.join(temp_test_directory, "line_numbers.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""Line 1 no match
-Line 2 has the pattern
-Line 3 no match
-Line 4 has the pattern again
-Line 5 no match
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with line number display
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "pattern",
-                    "directory": os.path.dirname(test_file),
-                    "arguments": f"-n --include='{os.path.basename(test_file)}'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that line numbers are included
-            assert "2:" in result_text
-            assert "4:" in result_text
+        test_dir = text_corpus["search_with_line_numbers"]
+        test_name = "line_numbers.txt"
+
+        # Call the tool with line number display
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "pattern",
+                "directory": test_dir,
+                "arguments": f"-n --include='{test_name}'",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "2:",
+                "4:",
+            ),
+        )
 
     async def test_exclude_paths_parameter(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with exclude_paths parameter."""
-        # Create test files in different folders
-        search_content = "search for this pattern"
-
-        # File in root
-        root_file = os.path.join(temp_test_directory, "root_file.txt")
-        with open(root_file, "w") as f:  # noqa: ASYNC230
-            f.write(search_content)
-
-        # File in subfolder1
-        sub_file = os.path.join(temp_test_directory, "subfolder1", "sub_file.txt")
-        with open(sub_file, "w") as f:  # noqa: ASYNC230
-            f.write(search_content)
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with path exclusions
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "search for this",
-                    "directory": temp_test_directory,
-                    "exclude_paths": "subfolder1",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Root file should be found
-            assert "root_file.txt" in result_text
-            # Subfolder1 file should be excluded
-            assert "subfolder1/sub_file.txt" not in result_text
+        test_dir = text_corpus["excludes"]
+
+        # Call the tool with path exclusions
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "search for this",
+                "directory": test_dir,
+                "exclude_paths": "subfolder1",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("root_file.py", "root_file.txt"),
+            not_contains=("subfolder1/sub_file.py", "subfolder1/sub_file.txt"),
+        )
 
     async def test_exclude_files_parameter(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the find-text-patterns tool with exclude_files parameter."""
-        # Create test files with different extensions
-        search_content = "find this text pattern"
-
-        py_file = os.path.join(temp_test_directory, "test_exclude.py")
-        txt_file = os.path.join(temp_test_directory, "test_exclude.txt")
-
-        with open(py_file, "w") as f:  # noqa: ASYNC230
-            f.write(search_content)
-        with open(txt_file, "w") as f:  # noqa: ASYNC230
-            f.write(search_content)
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with file exclusions
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "find this text",
-                    "directory": temp_test_directory,
-                    "exclude_files": "*.txt",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Python file should be found
-            assert "test_exclude.py" in result_text
-            # Text file should be excluded
-            assert "test_exclude.txt" not in result_text
+        test_dir = text_corpus["excludes"]
+
+        # Call the tool with file exclusions
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "search for this",
+                "directory": test_dir,
+                "exclude_files": "*.txt",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("root_file.py", "subfolder1/sub_file.py"),
+            not_contains=("root_file.txt", "subfolder1/sub_file.txt"),
+        )
 
     async def test_non_existent_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test the find-text-patterns tool with a non-existent directory."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent directory
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "test",
-                    "directory": "/path/that/does/not/exist",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Should get the directory not found message
-            assert "Directory does not exist: /path/that/does/not/exist" in result_text
+        # Call the tool with a non-existent directory
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "test",
+                "directory": "/path/that/does/not/exist",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=("Directory does not exist: /path/that/does/not/exist",),
+        )
 
     async def test_gitignore_pattern_with_context_args(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         r"""
         Test the find-text-patterns tool with specific case that was causing hangs.
@@ -1352,339 +1186,208 @@ Line 5 no match
         This test reproduces the exact case mentioned in the issue:
         pattern: "\.gitignore", arguments: "-A 5 -B 5"
         """
-        # Create a test file that mentions .gitignore
-        test_file = os.path.join(temp_test_directory, "config_info.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""Configuration files:
-Line before gitignore mention
-The .gitignore file controls what files are ignored
-Line after gitignore mention
-Another line after
-Final line
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # This was the exact case that was hanging due to incorrect argument order
-            result = await session.call_tool(
-                "find-text-patterns",
-                {
-                    "pattern": "\\.gitignore",
-                    "directory": temp_test_directory,
-                    "arguments": "-A 5 -B 5",
-                },
-            )
-
-            # Verify we got some output and it didn't hang
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the pattern is found
-            assert ".gitignore file controls" in result_text
-
-            # Check that context lines are included (5 before and 5 after)
-            assert "Line before gitignore mention" in result_text  # Before
-            assert "Line after gitignore mention" in result_text   # After
-            assert "Another line after" in result_text            # More after
-            assert "Final line" in result_text                    # Even more after
-
-
-@pytest.mark.asyncio
+        test_dir = text_corpus["gitignore_pattern"]
+
+        # This was the exact case that was hanging due to incorrect argument order
+        result = await mcp_session.call_tool(
+            "find-text-patterns",
+            {
+                "pattern": "\\.gitignore",
+                "directory": test_dir,
+                "arguments": "-A 5 -B 5",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                ".gitignore file controls",
+                "Line before gitignore mention",  # Before
+                "Line after gitignore mention",  # After
+                "Another line after",  # More after
+                "Final line",  # Even more after
+            ),
+        )
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestExtractFileText:
     """Test the extract-file-text tool from the default configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the extract-file-text tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
+        # Verify tool exists
+        assert "extract-file-text" in tools_by_name
 
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "extract-file-text" in tool_names
+        # Get the tool details
+        extract_file_tool = tools_by_name["extract-file-text"]
 
-            # Get the tool details
-            extract_file_tool = next(t for t in tools.tools if t.name == "extract-file-text")
+        # Check tool schema has the expected parameters
+        assert "file" in extract_file_tool.inputSchema["properties"]
+        assert "arguments" in extract_file_tool.inputSchema["properties"]
 
-            # Check tool schema has the expected parameters
-            assert "file" in extract_file_tool.inputSchema["properties"]
-            assert "arguments" in extract_file_tool.inputSchema["properties"]
-
-            # Verify only 'file' is required
-            assert "required" in extract_file_tool.inputSchema
-            assert "file" in extract_file_tool.inputSchema["required"]
-            assert "arguments" not in extract_file_tool.inputSchema["required"]
+        # Verify only 'file' is required
+        assert "required" in extract_file_tool.inputSchema
+        assert "file" in extract_file_tool.inputSchema["required"]
+        assert "arguments" not in extract_file_tool.inputSchema["required"]
 
     async def test_basic_file_extraction(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the extract-file-text tool with basic usage."""
-        # Create a test file
-        test_file = os.path.join(temp_test_directory, "extract_test.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""Line 1: Test content
-Line 2: More content
-Line 3: Final content""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to extract the file content
-            result = await session.call_tool(
-                "extract-file-text",
-                {"file": test_file},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the content is displayed with line numbers
-            assert "1" in result_text
-            assert "Line 1: Test content" in result_text
-            assert "2" in result_text
-            assert "Line 2: More content" in result_text
-            assert "3" in result_text
-            assert "Line 3: Final content" in result_text
+        test_file = os.path.join(text_corpus["basic_file_extraction"], "extract_test.txt")
+
+        # Call the tool to extract the file content
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {"file": test_file},
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "1",
+                "Line 1: Test content",
+                "2",
+                "Line 2: More content",
+                "3",
+                "Line 3: Final content",
+            ),
+        )
 
     async def test_extract_specific_lines(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the extract-file-text tool with line filtering."""
-        # Create a test file with multiple lines
-        test_file = os.path.join(temp_test_directory, "multi_line.txt")
-        content = "\n".join([f"Line {i}" for i in range(1, 11)])
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write(content)
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to extract specific lines (3-5)
-            result = await session.call_tool(
-                "extract-file-text",
-                {
-                    "file": test_file,
-                    "arguments": "| sed -n '3,5p'",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only lines 3-5 are included (with new line numbers starting at 1)
-            assert "Line 3" in result_text
-            assert "Line 4" in result_text
-            assert "Line 5" in result_text
-            assert "Line 1" not in result_text
-            assert "Line 2" not in result_text
-            assert "Line 6" not in result_text
+        test_file = os.path.join(text_corpus["extract_specific_lines"], "multi_line.txt")
+
+        # Call the tool to extract specific lines (3-5)
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {
+                "file": test_file,
+                "arguments": "| sed -n '3,5p'",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "Line 3",
+                "Line 4",
+                "Line 5",
+            ),
+            not_contains=(
+                "Line 1",
+                "Line 2",
+                "Line 6",
+            ),
+        )
 
     async def test_extract_with_filtering(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the extract-file-text tool with content filtering."""
-        # Create a test file with mixed content
-        test_file = os.path.join(temp_test_directory, "mixed_content.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""INFO: System started
-DEBUG: Initializing components
-ERROR: Failed to connect to database
-INFO: Retrying connection
-DEBUG: Connection parameters
-ERROR: Connection timeout
-INFO: Shutdown initiated""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to extract only ERROR lines
-            result = await session.call_tool(
-                "extract-file-text",
-                {
-                    "file": test_file,
-                    "arguments": "| grep ERROR",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that only ERROR lines are included
-            assert "ERROR: Failed to connect to database" in result_text
-            assert "ERROR: Connection timeout" in result_text
-            assert "INFO:" not in result_text
-            assert "DEBUG:" not in result_text
+        test_file = os.path.join(text_corpus["extract_with_filtering"], "mixed_content.txt")
+
+        # Call the tool to extract only ERROR lines
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {
+                "file": test_file,
+                "arguments": "| grep ERROR",
+            },
+        )
+
+        assert_ok(
+            result,
+            contains=(
+                "ERROR: Failed to connect to database",
+                "ERROR: Connection timeout",
+            ),
+            not_contains=(
+                "INFO:",
+                "DEBUG:",
+            ),
+        )
 
     async def test_json_formatting(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the extract-file-text tool with JSON formatting."""
-        # Create a test JSON file (unformatted)
-        test_file = os.path.join(temp_test_directory, "test.json")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write('{"name":"Test","values":[1,2,3],"nested":{"key":"value"}}')
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to format the JSON
-            result = await session.call_tool(
-                "extract-file-text",
-                {
-                    "file": test_file,
-                    "arguments": "| python3 -m json.tool",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the JSON is properly formatted
-            # Since line numbers might be present and formatting might vary,
-            # look for basic patterns
-            assert "name" in result_text
-            assert "Test" in result_text
-            assert "values" in result_text
-            assert "nested" in result_text
-            assert "key" in result_text
-            assert "value" in result_text
-
-            # The formatted output should be longer than the original
-            # since it adds spaces and newlines
-            assert len(result_text) > len('{"name":"Test","values":[1,2,3],"nested":{"key":"value"}}')  # noqa: E501
+        test_file = os.path.join(text_corpus["json_formatting"], "test.json")
+
+        # Call the tool to format the JSON
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {
+                "file": test_file,
+                "arguments": "| python3 -m json.tool",
+            },
+        )
+
+        result_text = assert_ok(
+            result,
+            contains=(
+                "name",
+                "Test",
+                "values",
+                "nested",
+                "key",
+                "value",
+            ),
+        )
+
+        # The formatted output should be longer than the original
+        # since it adds spaces and newlines
+        assert len(result_text) > len('{"name":"Test","values":[1,2,3],"nested":{"key":"value"}}')
 
     async def test_non_existent_file(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test the extract-file-text tool with a non-existent file."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent file
-            result = await session.call_tool(
-                "extract-file-text",
-                {"file": "/path/that/doesnt/exist.txt"},
-            )
+        # Call the tool with a non-existent file
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {"file": "/path/that/doesnt/exist.txt"},
+        )
 
-            # Verify we got some output (likely an error message)
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        result_text = assert_ok(result)
 
-            # Just check that we received some output
-            assert len(result_text) > 0
+        # Just check that we received some output
+        assert len(result_text) > 0
 
     async def test_extract_binary_file(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        text_corpus: dict[str, str],
     ):
         """Test the extract-file-text tool with a binary file."""
-        # Create a simple binary file
-        binary_file = os.path.join(temp_test_directory, "binary.bin")
-        with open(binary_file, "wb") as f:  # noqa: ASYNC230
-            f.write(bytes([0x00, 0x01, 0x02, 0x03, 0xFF, 0xFE, 0xFD, 0xFC]))
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to extract the binary content
-            result = await session.call_tool(
-                "extract-file-text",
-                {"file": binary_file},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
-
-
-@pytest.mark.asyncio
-class TestExtractCodeInfo:
-    """Test the extract-code-info tool from the default configuration."""
+        binary_file = os.path.join(text_corpus["extract_binary_file"], "binary.bin")
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test that the extract-code-info tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "extract-code-info" in tool_names
-
-            # Get the tool details
-            extract_code_tool = next(t for t in tools.tools if t.name == "extract-code-info")
-
-            # Check tool schema has the expected parameters
-            assert "files" in extract_code_tool.inputSchema["properties"]
-            assert "types" in extract_code_tool.inputSchema["properties"]
-            assert "exclude_paths" in extract_code_tool.inputSchema["properties"]
-            assert "exclude_files" in extract_code_tool.inputSchema["properties"]
-
-            # Verify both 'files' and 'types' are required
-            assert "required" in extract_code_tool.inputSchema
-            assert "files" in extract_code_tool.inputSchema["required"]
-            assert "types" in extract_code_tool.inputSchema["required"]
-            assert "exclude_paths" not in extract_code_tool.inputSchema["required"]
-            assert "exclude_files" not in extract_code_tool.inputSchema["required"]
+        # Call the tool to extract the binary content
+        result = await mcp_session.call_tool(
+            "extract-file-text",
+            {"file": binary_file},
+        )
 
-    async def test_tool_can_be_called(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test that the extract-code-info tool can be called correctly."""
-        # Create a Python file with actual functions, classes, imports, and TODOs
-        test_file = os.path.join(temp_test_directory, "test.py")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""import os
+        # Verify we got some output
+        assert 'Error' in output_text(result)
+
+
+# Files for the extract-code-info tests, keyed by the test that reads them
+CODE_CORPUS: dict[str, dict[str, bytes]] = {
+    "tool_can_be_called": {
+        "test.py": b"""import os
 from pathlib import Path
 
 class TestClass:
@@ -1702,42 +1405,10 @@ def standalone_function():
     print('Hello world')
     # FIXME: this needs improvement
     return True
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with functions type
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": test_file,
-                    "types": "functions",
-                },
-            )
-
-            # Verify that the call returns actual function definitions
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-            assert isinstance(result_text, str)
-            # Check that it found the actual functions
-            assert "def __init__(self):" in result_text
-            assert "def test_method(self):" in result_text
-            assert "def standalone_function():" in result_text
-
-    async def test_different_types_parameter(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test that the extract-code-info tool can be called with different types parameters."""
-        # Create a Python file with actual content
-        test_file = os.path.join(temp_test_directory, "multi_type.py")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""import json
+""",
+    },
+    "different_types_parameter": {
+        "multi_type.py": b"""import json
 from datetime import datetime
 
 class DataProcessor:
@@ -1747,53 +1418,10 @@ class DataProcessor:
 class ResultHandler:
     '''Handles results.'''
     pass
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Test classes type
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": test_file,
-                    "types": "classes",
-                },
-            )
-
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-            assert "class DataProcessor:" in result_text
-            assert "class ResultHandler:" in result_text
-
-            # Test imports type
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": test_file,
-                    "types": "imports",
-                },
-            )
-
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-            assert "import json" in result_text
-            assert "from datetime import datetime" in result_text
-
-    async def test_multiple_types_parameter(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test that the extract-code-info tool can be called with multiple types parameters."""
-        # Create a comprehensive Python file
-        test_file = os.path.join(temp_test_directory, "multi_param.py")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""import sys
+""",
+    },
+    "multiple_types_parameter": {
+        "multi_param.py": b"""import sys
 from collections import defaultdict
 
 class ConfigManager:
@@ -1811,270 +1439,333 @@ def process_data(data):
     '''Process the input data.'''
     # TODO: add validation
     return data.upper()
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with all types
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": test_file,
-                    "types": "functions,classes,imports,todos",
-                },
-            )
-
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check all types are found
-            assert "--- functions ---" in result_text
-            assert "--- classes ---" in result_text
-            assert "--- imports ---" in result_text
-            assert "--- todos ---" in result_text
-
-            # Check specific content
-            assert "def load_config(self):" in result_text
-            assert "class ConfigManager:" in result_text
-            assert "import sys" in result_text
-            assert "TODO: implement config loading" in result_text
-            assert "FIXME: add error handling" in result_text
-
-    async def test_absolute_path_support(
-        self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
-    ):
-        """Test that the extract-code-info tool works with absolute paths."""
-        # Create a Python file with functions in a subdirectory
-        subdir = os.path.join(temp_test_directory, "subdir")
-        os.makedirs(subdir, exist_ok=True)
-        test_file = os.path.join(subdir, "absolute_test.py")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("""def absolute_function():
+""",
+    },
+    "absolute_path_support": {
+        "subdir/absolute_test.py": b"""def absolute_function():
     '''Function to test absolute path extraction.'''
     return "absolute"
 
 class AbsoluteClass:
     '''Class to test absolute path extraction.'''
     pass
-""")
-
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Test with absolute path (this was the original issue)
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": test_file,  # This is an absolute path
-                    "types": "functions,classes",
-                },
-            )
+""",
+    },
+    "wildcard_path_support": {
+        "file1.py": b"def function_one(): pass",
+        "file2.py": b"def function_two(): pass",
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def code_corpus() -> Iterator[Path]:
+    """
+    Write the files in CODE_CORPUS once for the module.
+
+    Yields:
+        The directory holding one subdirectory of files per CODE_CORPUS key.
+    """
+    root = Path(make_temp_dir())
+    try:
+        write_files({
+            str(root / name / file_path): content
+            for name, files in CODE_CORPUS.items()
+            for file_path, content in files.items()
+        })
+        yield root
+    finally:
+        shutil.rmtree(root)
 
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
 
-            # Verify it found the function and class
-            assert "def absolute_function():" in result_text
-            assert "class AbsoluteClass:" in result_text
-            assert "=== File:" in result_text
-            assert "absolute_test.py" in result_text
+@pytest.mark.asyncio(loop_scope="module")
+class TestExtractCodeInfo:
+    """Test the extract-code-info tool from the default configuration."""
 
-    async def test_wildcard_path_support(
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
+        """Test that the extract-code-info tool is properly registered."""
+        # Verify tool exists
+        assert "extract-code-info" in tools_by_name
+
+        # Get the tool details
+        extract_code_tool = tools_by_name["extract-code-info"]
+
+        # Check tool schema has the expected parameters
+        assert "files" in extract_code_tool.inputSchema["properties"]
+        assert "types" in extract_code_tool.inputSchema["properties"]
+        assert "exclude_paths" in extract_code_tool.inputSchema["properties"]
+        assert "exclude_files" in extract_code_tool.inputSchema["properties"]
+
+        # Verify both 'files' and 'types' are required
+        assert "required" in extract_code_tool.inputSchema
+        assert "files" in extract_code_tool.inputSchema["required"]
+        assert "types" in extract_code_tool.inputSchema["required"]
+        assert "exclude_paths" not in extract_code_tool.inputSchema["required"]
+        assert "exclude_files" not in extract_code_tool.inputSchema["required"]
+
+    @pytest.mark.parametrize(
+        ("corpus_file", "types", "expected"),
+        [
+            pytest.param(
+                "tool_can_be_called/test.py",
+                "functions",
+                ("def __init__(self):", "def test_method(self):", "def standalone_function():"),
+                id="functions",
+            ),
+            pytest.param(
+                "different_types_parameter/multi_type.py",
+                "classes",
+                ("class DataProcessor:", "class ResultHandler:"),
+                id="classes",
+            ),
+            pytest.param(
+                "different_types_parameter/multi_type.py",
+                "imports",
+                ("import json", "from datetime import datetime"),
+                id="imports",
+            ),
+            pytest.param(
+                "multiple_types_parameter/multi_param.py",
+                "functions,classes,imports,todos",
+                (
+                    # Check all types are found
+                    "--- functions ---",
+                    "--- classes ---",
+                    "--- imports ---",
+                    "--- todos ---",
+                    # Check specific content
+                    "def load_config(self):",
+                    "class ConfigManager:",
+                    "import sys",
+                    "TODO: implement config loading",
+                    "FIXME: add error handling",
+                ),
+                id="multiple-types",
+            ),
+        ],
+    )
+    async def test_tool_can_be_called(
         self,
-        server_params: StdioServerParameters,
-        temp_test_directory: str,
+        mcp_session: ClientSession,
+        code_corpus: Path,
+        corpus_file: str,
+        types: str,
+        expected: tuple[str, ...],
     ):
-        """Test that the extract-code-info tool works with wildcard paths."""
-        # Create multiple Python files
-        test_file1 = os.path.join(temp_test_directory, "file1.py")
-        test_file2 = os.path.join(temp_test_directory, "file2.py")
-
-        with open(test_file1, "w") as f:  # noqa: ASYNC230
-            f.write("def function_one(): pass")
+        """Test that the extract-code-info tool finds the code of each requested type."""
+        test_file = str(code_corpus / corpus_file)
 
-        with open(test_file2, "w") as f:  # noqa: ASYNC230
-            f.write("def function_two(): pass")
+        result = await mcp_session.call_tool(
+            "extract-code-info",
+            {
+                "files": test_file,
+                "types": types,
+            },
+        )
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
+        assert_ok(result, contains=expected)
 
-            # Test with wildcard pattern
-            wildcard_pattern = os.path.join(temp_test_directory, "*.py")
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": wildcard_pattern,
-                    "types": "functions",
-                },
-            )
-
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+    async def test_non_existent_file(
+        self,
+        mcp_session: ClientSession,
+        code_corpus: Path,
+    ):
+        """Test that the extract-code-info tool returns nothing for a file that doesn't exist."""
+        result = await mcp_session.call_tool(
+            "extract-code-info",
+            {
+                "files": str(code_corpus / "non_existent" / "doesnt_exist.py"),
+                "types": "functions",
+            },
+        )
+
+        # find matches no files and its error goes to /dev/null, so the output is empty
+        assert output_text(result) == ""
 
-            # Should find functions from both files
-            assert "def function_one():" in result_text
-            assert "def function_two():" in result_text
+    async def test_absolute_path_support(
+        self,
+        mcp_session: ClientSession,
+        code_corpus: Path,
+    ):
+        """Test that the extract-code-info tool works with absolute paths."""
+        # A Python file with functions in a subdirectory
+        test_file = str(code_corpus / "absolute_path_support" / "subdir" / "absolute_test.py")
+
+        # Test with absolute path (this was the original issue)
+        result = await mcp_session.call_tool(
+            "extract-code-info",
+            {
+                "files": test_file,  # This is an absolute path
+                "types": "functions,classes",
+            },
+        )
+
+        # Verify it found the function and class
+        assert_ok(
+            result,
+            contains=(
+                "def absolute_function():",
+                "class AbsoluteClass:",
+                "=== File:",
+                "absolute_test.py",
+            ),
+        )
 
-    async def test_non_existent_file(
+    async def test_wildcard_path_support(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
+        code_corpus: Path,
     ):
-        """Test the extract-code-info tool with a non-existent file."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent file
-            result = await session.call_tool(
-                "extract-code-info",
-                {
-                    "files": "/path/that/doesnt/exist.py",
-                    "types": "functions",
-                },
-            )
+        """Test that the extract-code-info tool works with wildcard paths."""
+        # Test with a wildcard pattern matching both of the corpus's Python files
+        wildcard_pattern = str(code_corpus / "wildcard_path_support" / "*.py")
+        result = await mcp_session.call_tool(
+            "extract-code-info",
+            {
+                "files": wildcard_pattern,
+                "types": "functions",
+            },
+        )
+
+        # Should find functions from both files
+        assert_ok(result, contains=("def function_one():", "def function_two():"))
+
+
+# Page served to the web-scraper tests in place of http://example.com
+EXAMPLE_PAGE = b"""<!doctype html>
+<html>
+<head>
+    <title>Example Domain</title>
+</head>
+<body>
+<div>
+    <h1>Example Domain</h1>
+    <p>This domain is for use in illustrative examples in documents.</p>
+</div>
+</body>
+</html>
+"""
+
+# Matches HTML source with html, head, and body tags in document order
+HTML_STRUCTURE = re.compile(r"<html.*<head.*<body", re.DOTALL | re.IGNORECASE)
+
+
+class ExamplePageHandler(BaseHTTPRequestHandler):
+    """Serve EXAMPLE_PAGE for every GET request."""
+
+    def do_GET(self) -> None:
+        """Respond with EXAMPLE_PAGE."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(EXAMPLE_PAGE)))
+        self.end_headers()
+        self.wfile.write(EXAMPLE_PAGE)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep request logs out of the test output."""
+
+
+@pytest.fixture(scope="module")
+def example_url() -> Iterator[str]:
+    """
+    Serve EXAMPLE_PAGE from a local HTTP server for the module.
+
+    The web-scraper tests fetch this page instead of http://example.com, so they don't depend
+    on the network.
+
+    Yields:
+        The URL of the page.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ExamplePageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
 
-            # Verify we got some output (likely an empty result)
-            assert result.content
-            result_text = result.content[0].text
-            assert isinstance(result_text, str)
-            # For non-existent files, we should get minimal output
-            assert len(result_text) >= 0
 
+@pytest.fixture
+def closed_url() -> str:
+    """
+    Get a localhost URL that nothing listens on.
+
+    The port is bound and then released, so fetching the URL is refused straight away without
+    a DNS lookup or any network access.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestWebScraper:
     """Test the web-scraper tool from the default configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the web-scraper tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "web-scraper" in tool_names
+        # Verify tool exists
+        assert "web-scraper" in tools_by_name
 
-            # Get the tool details
-            web_scraper_tool = next(t for t in tools.tools if t.name == "web-scraper")
+        # Get the tool details
+        web_scraper_tool = tools_by_name["web-scraper"]
 
-            # Check tool schema has the expected parameters
-            assert "url" in web_scraper_tool.inputSchema["properties"]
-            assert "dump_options" in web_scraper_tool.inputSchema["properties"]
+        # Check tool schema has the expected parameters
+        assert "url" in web_scraper_tool.inputSchema["properties"]
+        assert "dump_options" in web_scraper_tool.inputSchema["properties"]
 
-            # Verify required parameters
-            assert "required" in web_scraper_tool.inputSchema
-            assert "url" in web_scraper_tool.inputSchema["required"]
-            assert "dump_options" not in web_scraper_tool.inputSchema["required"]
+        # Verify required parameters
+        assert "required" in web_scraper_tool.inputSchema
+        assert "url" in web_scraper_tool.inputSchema["required"]
+        assert "dump_options" not in web_scraper_tool.inputSchema["required"]
 
-    async def test_basic_scraping(
+    async def test_scraping(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
+        example_url: str,
+        closed_url: str,
     ):
-        """Test the web-scraper tool with basic usage - using a simple, stable URL."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a stable URL (example.com)
-            result = await session.call_tool(
-                "web-scraper",
-                {"url": "http://example.com"},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        """
+        Test the web-scraper tool with basic usage, dump options, and an invalid URL.
 
+        The calls are independent and mostly wait on lynx, so they run concurrently. Every result
+        is checked, and all failing cases are reported together by id.
+        """
+        basic, narrow, source, invalid = await call_many(
+            mcp_session,
+            "web-scraper",
+            [
+                # Basic usage
+                {"url": example_url},
+                # Custom width option
+                {"url": example_url, "dump_options": "-width=50"},
+                # Source option to get HTML
+                {"url": example_url, "dump_options": "-source"},
+                # A URL that can't be fetched
+                {"url": closed_url},
+            ],
+        )
+
+        problems_by_case = {
             # Check for expected content in the output
-            # example.com is very stable and should contain these phrases
-            assert "Example Domain" in result_text
-            assert "illustrative examples" in result_text
-
-    async def test_with_dump_options(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test the web-scraper tool with custom dump options."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with custom width option
-            result = await session.call_tool(
-                "web-scraper",
-                {
-                    "url": "http://example.com",
-                    "dump_options": "-width=50",  # Set a narrow width
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # The content should still contain the expected text
-            assert "Example Domain" in result_text
-
-            # Test with source option to get HTML
-            result2 = await session.call_tool(
-                "web-scraper",
-                {
-                    "url": "http://example.com",
-                    "dump_options": "-source",  # Get source HTML
-                },
-            )
-
-            # Verify we got some output
-            assert result2.content
-            result2_text = result2.content[0].text
-
-            # Source HTML should contain HTML tags
-            assert "<html" in result2_text
-            assert "<head" in result2_text
-            assert "<body" in result2_text
-
-    async def test_invalid_url(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test the web-scraper tool with an invalid or non-existent URL."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with an invalid URL
-            result = await session.call_tool(
-                "web-scraper",
-                {"url": "http://this-domain-does-not-exist-123456789.com"},
-            )
-
-            # Verify we got some output (likely an error message)
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert len(result_text) > 0
+            "basic": output_problems(basic, contains=("Example Domain", "illustrative examples")),
+            # The narrow output should still contain the expected text
+            "custom-width": output_problems(narrow, contains=("Example Domain",)),
+            # Source HTML should contain the html, head, and body tags, in that order
+            "source": (
+                [] if HTML_STRUCTURE.search(output_text(source))
+                else [f"No html, head and body tags in output: {output_text(source)!r}"]
+            ),
+            # The invalid URL should produce an error message
+            "invalid-url": (
+                [] if 'Error' in output_text(invalid)
+                else [f"No error in output: {output_text(invalid)!r}"]
+            ),
+        }
+        failures = {
+            case_id: problems for case_id, problems in problems_by_case.items() if problems
+        }
+        assert not failures, f"Failing web-scraper cases: {failures}"
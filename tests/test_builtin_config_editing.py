@@ -1,108 +1,73 @@
 """Unit tests for the editing tools."""
+import asyncio
+from collections.abc import Iterator
 import pytest
-import aiofiles
 import tempfile
 import os
 import shutil
+from pathlib import Path
 from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
+from mcp.types import Tool
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def server_params() -> StdioServerParameters:
-    """Create server parameters with default configuration."""
+    """Create server parameters for the editing preset, once for the module."""
     return StdioServerParameters(
         command="python",
         args=["-m", "mcp_this", "--preset", "editing"],
     )
 
 
-@pytest.fixture
-def temp_test_directory():
-    """Create a temporary directory with a test structure."""
-    # Create a temporary directory
-    temp_dir = tempfile.mkdtemp()
-    try:
-        # Create a test directory structure
-        test_files = [
-            "file1.txt",
-            "file2.py",
-            "subfolder1/file3.txt",
-            "subfolder1/file4.py",
-            "subfolder1/deeper/file5.txt",
-            "subfolder2/file6.py",
-            ".hidden_file",
-            ".hidden_folder/hidden_file.txt",
-        ]
+@pytest.fixture(scope="module")
+def temp_root() -> Iterator[str]:
+    """Create one temporary directory to hold all of the module's test directories."""
+    with tempfile.TemporaryDirectory(prefix="mcp-edit-") as root:
+        yield root
 
-        # Create files
-        for file_path in test_files:
-            full_path = os.path.join(temp_dir, file_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, "w") as f:
-                f.write(f"Content of {file_path}")
-
-        # Create a .gitignore file
-        with open(os.path.join(temp_dir, ".gitignore"), "w") as f:
-            f.write("*.pyc\n")
-            f.write("__pycache__/\n")
-            f.write("subfolder2/\n")  # Ignore subfolder2
-
-        # Create a file that should be ignored by .gitignore
-        ignored_file = os.path.join(temp_dir, "ignored_file.pyc")
-        with open(ignored_file, "w") as f:
-            f.write("This file should be ignored by .gitignore")
-
-        # Create a file in subfolder2 (should be ignored by .gitignore)
-        ignored_by_gitignore = os.path.join(temp_dir, "subfolder2/ignored.txt")
-        with open(ignored_by_gitignore, "w") as f:
-            f.write("This file should be ignored by .gitignore")
 
+@pytest.fixture
+def temp_test_directory(temp_root: str):
+    """
+    Create an empty temporary directory for a test's files.
+
+    The tests only work on files and directories they create themselves, so no test structure
+    is created in it.
+    """
+    temp_dir = tempfile.mkdtemp(dir=temp_root)
+    try:
         yield temp_dir
     finally:
-        # Clean up
         shutil.rmtree(temp_dir)
 
 
-
-
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestEditFile:
     """Test the edit-file tool from the editing configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the edit-file tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "edit-file" in tool_names
-
-            # Get the tool details
-            edit_file_tool = next(t for t in tools.tools if t.name == "edit-file")
-
-            # Check tool schema has the expected parameters
-            expected_parameters = [
-                "file", "operation", "anchor", "content", "start_line", "end_line",
-            ]
-            for param in expected_parameters:
-                assert param in edit_file_tool.inputSchema["properties"]
-
-            # Verify required parameters
-            assert "required" in edit_file_tool.inputSchema
-            assert "file" in edit_file_tool.inputSchema["required"]
-            assert "operation" in edit_file_tool.inputSchema["required"]
+        # Verify tool exists
+        assert "edit-file" in tools_by_name
+
+        # Get the tool details
+        edit_file_tool = tools_by_name["edit-file"]
+
+        # Check tool schema has the expected parameters
+        expected_parameters = [
+            "file", "operation", "anchor", "content", "start_line", "end_line",
+        ]
+        for param in expected_parameters:
+            assert param in edit_file_tool.inputSchema["properties"]
+
+        # Verify required parameters
+        assert "required" in edit_file_tool.inputSchema
+        assert "file" in edit_file_tool.inputSchema["required"]
+        assert "operation" in edit_file_tool.inputSchema["required"]
 
     async def test_basic_operation(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test that the edit-file tool can be called successfully."""
@@ -111,42 +76,32 @@ class TestEditFile:
         with open(test_file, "w") as f:  # noqa: ASYNC230
             f.write("Line 1\nLine 2\nLine 3\n")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a basic operation
-            result = await session.call_tool(
-                "edit-file",
-                {
-                    "file": test_file,
-                    "operation": "replace",
-                    "anchor": "Line 2",
-                    "content": "Replaced Line",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # We just verify that the command returned some output
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
+        # Call the tool with a basic operation
+        result = await mcp_session.call_tool(
+            "edit-file",
+            {
+                "file": test_file,
+                "operation": "replace",
+                "anchor": "Line 2",
+                "content": "Replaced Line",
+            },
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
+
+        # We just verify that the command returned some output
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
 
     async def test_with_different_operations(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test the edit-file tool with different operations."""
-        # Create a test file
-        test_file = os.path.join(temp_test_directory, "test_operations.txt")
-        with open(test_file, "w") as f:  # noqa: ASYNC230
-            f.write("Line 1\nLine 2\nLine 3\n")
-
         operations = [
             "insert_after",
             "insert_before",
@@ -154,38 +109,45 @@ class TestEditFile:
             "delete",
         ]
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with each operation
-            for operation in operations:
-                params = {
-                    "file": test_file,
-                    "operation": operation,
-                    "anchor": "Line 2",
-                }
-
-                # Content is required for all operations except delete
-                if operation != "delete":
-                    params["content"] = "Test Content"
-
-                # Call the tool
-                result = await session.call_tool("edit-file", params)
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-                assert 'Error' not in result_text
+        # Create a test file per operation, so the operations can run concurrently
+        test_files = {
+            operation: os.path.join(temp_test_directory, f"test_{operation}.txt")
+            for operation in operations
+        }
+        for test_file in test_files.values():
+            with open(test_file, "w") as f:  # noqa: ASYNC230
+                f.write("Line 1\nLine 2\nLine 3\n")
+
+        calls = []
+        for operation, test_file in test_files.items():
+            params = {
+                "file": test_file,
+                "operation": operation,
+                "anchor": "Line 2",
+            }
+
+            # Content is required for all operations except delete
+            if operation != "delete":
+                params["content"] = "Test Content"
+
+            calls.append(mcp_session.call_tool("edit-file", params))
+
+        # Call the tool with each operation
+        results = await asyncio.gather(*calls)
+
+        for result in results:
+            # Verify we got some output
+            assert result.content
+            result_text = result.content[0].text
+            assert 'Error' not in result_text
 
-                # We just verify that the command returned some output
-                assert isinstance(result_text, str)
-                assert len(result_text) > 0
+            # We just verify that the command returned some output
+            assert isinstance(result_text, str)
+            assert len(result_text) > 0
 
     async def test_replace_range_operation(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test the edit-file tool with replace_range operation."""
@@ -194,37 +156,30 @@ class TestEditFile:
         with open(test_file, "w") as f:  # noqa: ASYNC230
             f.write("Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to replace a range of lines
-            result = await session.call_tool(
-                "edit-file",
-                {
-                    "file": test_file,
-                    "operation": "replace_range",
-                    "start_line": "2",
-                    "end_line": "4",
-                    "content": "Replaced Range",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # We just verify that the command returned some output
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
-
-
+        # Call the tool to replace a range of lines
+        result = await mcp_session.call_tool(
+            "edit-file",
+            {
+                "file": test_file,
+                "operation": "replace_range",
+                "start_line": "2",
+                "end_line": "4",
+                "content": "Replaced Range",
+            },
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
+
+        # We just verify that the command returned some output
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
 
     async def test_with_invalid_operation(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test the edit-file tool with an invalid operation."""
@@ -233,95 +188,75 @@ class TestEditFile:
         with open(test_file, "w") as f:  # noqa: ASYNC230
             f.write("Line 1\nLine 2\nLine 3\n")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with an invalid operation
-            result = await session.call_tool(
-                "edit-file",
-                {
-                    "file": test_file,
-                    "operation": "invalid_operation",
-                    "anchor": "Line 2",
-                    "content": "New Content",
-                },
-            )
-
-            # Verify we got some output (likely an error message)
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
+        # Call the tool with an invalid operation
+        result = await mcp_session.call_tool(
+            "edit-file",
+            {
+                "file": test_file,
+                "operation": "invalid_operation",
+                "anchor": "Line 2",
+                "content": "New Content",
+            },
+        )
+
+        # Verify we got some output (likely an error message)
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' in result_text
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
 
     async def test_non_existent_file(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test the edit-file tool with a non-existent file."""
         non_existent_file = os.path.join(temp_test_directory, "non_existent.txt")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with a non-existent file
-            result = await session.call_tool(
-                "edit-file",
-                {
-                    "file": non_existent_file,
-                    "operation": "insert_after",
-                    "anchor": "Pattern",
-                    "content": "New Content",
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' in result_text
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
-
-
-@pytest.mark.asyncio
+        # Call the tool with a non-existent file
+        result = await mcp_session.call_tool(
+            "edit-file",
+            {
+                "file": non_existent_file,
+                "operation": "insert_after",
+                "anchor": "Pattern",
+                "content": "New Content",
+            },
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' in result_text
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestCreateFile:
     """Test the create-file tool from the editing configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the create-file tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
+        # Verify tool exists
+        assert "create-file" in tools_by_name
 
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "create-file" in tool_names
+        # Get the tool details
+        create_file_tool = tools_by_name["create-file"]
 
-            # Get the tool details
-            create_file_tool = next(t for t in tools.tools if t.name == "create-file")
+        # Check tool schema has the expected parameters
+        assert "path" in create_file_tool.inputSchema["properties"]
+        assert "content" in create_file_tool.inputSchema["properties"]
 
-            # Check tool schema has the expected parameters
-            assert "path" in create_file_tool.inputSchema["properties"]
-            assert "content" in create_file_tool.inputSchema["properties"]
-
-            # Verify required parameters
-            assert "required" in create_file_tool.inputSchema
-            assert "path" in create_file_tool.inputSchema["required"]
-            assert "content" not in create_file_tool.inputSchema["required"]
+        # Verify required parameters
+        assert "required" in create_file_tool.inputSchema
+        assert "path" in create_file_tool.inputSchema["required"]
+        assert "content" not in create_file_tool.inputSchema["required"]
 
     async def test_create_simple_file(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a simple file."""
@@ -329,38 +264,32 @@ class TestCreateFile:
         test_file = os.path.join(temp_test_directory, "test_create.txt")
         file_content = "This is a test file content"
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to create a file
-            result = await session.call_tool(
-                "create-file",
-                {
-                    "path": test_file,
-                    "content": file_content,
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the call was successful
-            assert "File created successfully" in result_text or "created successfully" in result_text  # noqa: E501
-
-            # Verify the file exists
-            assert os.path.exists(test_file)
-            # Read file and strip any trailing whitespace/newlines for comparison
-            async with aiofiles.open(test_file) as f:
-                content = await f.read()
-                assert content == file_content
+        # Call the tool to create a file
+        result = await mcp_session.call_tool(
+            "create-file",
+            {
+                "path": test_file,
+                "content": file_content,
+            },
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
+
+        # Check that the call was successful
+        assert "created successfully" in result_text
+
+        # Verify the file exists
+        assert os.path.exists(test_file)
+        # Read file and strip any trailing whitespace/newlines for comparison
+        content = Path(test_file).read_text()  # noqa: ASYNC240
+        assert content == file_content
 
     async def test_create_file_with_nested_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a file in a nested directory that doesn't exist yet."""
@@ -369,39 +298,33 @@ class TestCreateFile:
         test_file = os.path.join(nested_dir, "test_nested.txt")
         file_content = "This file is in a nested directory"
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to create a file (should create parent directories)
-            result = await session.call_tool(
-                "create-file",
-                {
-                    "path": test_file,
-                    "content": file_content,
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the call was successful
-            assert "File created successfully" in result_text or "created successfully" in result_text  # noqa: E501
-
-            # Verify the directory and file exist
-            assert os.path.exists(nested_dir)
-            assert os.path.exists(test_file)
-            # Read file and strip any trailing whitespace/newlines for comparison
-            async with aiofiles.open(test_file) as f:
-                content = await f.read()
-                assert content == file_content
+        # Call the tool to create a file (should create parent directories)
+        result = await mcp_session.call_tool(
+            "create-file",
+            {
+                "path": test_file,
+                "content": file_content,
+            },
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
+
+        # Check that the call was successful
+        assert "created successfully" in result_text
+
+        # Verify the directory and file exist
+        assert os.path.exists(nested_dir)
+        assert os.path.exists(test_file)
+        # Read file and strip any trailing whitespace/newlines for comparison
+        content = Path(test_file).read_text()  # noqa: ASYNC240
+        assert content == file_content
 
     async def test_create_file_that_already_exists(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a file that already exists."""
@@ -410,210 +333,167 @@ class TestCreateFile:
         with open(existing_file, "w") as f:  # noqa: ASYNC230
             f.write("Original content")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to try to create the same file
-            result = await session.call_tool(
-                "create-file",
-                {
-                    "path": existing_file,
-                    "content": "New content",
-                },
-            )
+        # Call the tool to try to create the same file
+        result = await mcp_session.call_tool(
+            "create-file",
+            {
+                "path": existing_file,
+                "content": "New content",
+            },
+        )
 
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
 
-            # Check that the operation didn't succeed
-            # The exact message might vary but it should indicate the file already exists
-            assert "already exists" in result_text or "Error" in result_text
+        # Check that the operation didn't succeed
+        # The exact message might vary but it should indicate the file already exists
+        assert "already exists" in result_text or "Error" in result_text
 
-            # Verify the file still has the original content
-            with open(existing_file) as f:  # noqa: ASYNC230
-                content = f.read()
-                assert content == "Original content"
+        # Verify the file still has the original content
+        assert Path(existing_file).read_text() == "Original content"  # noqa: ASYNC240
 
     async def test_create_file_with_multiline_content(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a file with multiline content preserves newlines."""
         test_file = os.path.join(temp_test_directory, "multiline.txt")
         file_content = "Line 1\nLine 2\nLine 3\n"  # Note the newlines
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
+        result = await mcp_session.call_tool(
+            "create-file",
+            {
+                "path": test_file,
+                "content": file_content,
+            },
+        )
 
-            result = await session.call_tool(
-                "create-file",
-                {
-                    "path": test_file,
-                    "content": file_content,
-                },
-            )
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
+        assert "File created successfully" in result_text
 
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-            assert "File created successfully" in result_text
-
-            # Verify exact content match (no stripping!)
-            async with aiofiles.open(test_file) as f:
-                actual_content = await f.read()
-                assert actual_content == file_content  # Exact match including newlines
+        # Verify exact content match (no stripping!)
+        actual_content = Path(test_file).read_text()  # noqa: ASYNC240
+        assert actual_content == file_content  # Exact match including newlines
 
-            # Also verify line count
-            async with aiofiles.open(test_file) as f:
-                lines = await f.readlines()
-                assert len(lines) == 3  # Should be 3 separate lines
-                assert lines[0] == "Line 1\n"
-                assert lines[1] == "Line 2\n"
-                assert lines[2] == "Line 3\n"
+        # Also verify the content splits into 3 separate lines
+        lines = actual_content.splitlines(keepends=True)
+        assert lines == ["Line 1\n", "Line 2\n", "Line 3\n"]
 
     async def test_create_empty_file(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating an empty file."""
         test_file = os.path.join(temp_test_directory, "empty.txt")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
+        result = await mcp_session.call_tool(
+            "create-file",
+            {
+                "path": test_file,
+                # No content parameter
+            },
+        )
 
-            result = await session.call_tool(
-                "create-file",
-                {
-                    "path": test_file,
-                    # No content parameter
-                },
-            )
-
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
 
-            # Verify file exists and is empty
-            assert os.path.exists(test_file)
-            async with aiofiles.open(test_file) as f:
-                content = await f.read()
-                assert content == ""
+        # Verify file exists and is empty
+        assert os.path.exists(test_file)
+        content = Path(test_file).read_text()  # noqa: ASYNC240
+        assert content == ""
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestCreateDirectory:
     """Test the create-directory tool from the editing configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the create-directory tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
-
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "create-directory" in tool_names
+        # Verify tool exists
+        assert "create-directory" in tools_by_name
 
-            # Get the tool details
-            create_dir_tool = next(t for t in tools.tools if t.name == "create-directory")
+        # Get the tool details
+        create_dir_tool = tools_by_name["create-directory"]
 
-            # Check tool schema has the expected parameters
-            assert "path" in create_dir_tool.inputSchema["properties"]
+        # Check tool schema has the expected parameters
+        assert "path" in create_dir_tool.inputSchema["properties"]
 
-            # Verify required parameters
-            assert "required" in create_dir_tool.inputSchema
-            assert "path" in create_dir_tool.inputSchema["required"]
+        # Verify required parameters
+        assert "required" in create_dir_tool.inputSchema
+        assert "path" in create_dir_tool.inputSchema["required"]
 
     async def test_create_simple_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a simple directory."""
         # Define a directory path
         test_dir = os.path.join(temp_test_directory, "test_create_dir")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
+        # Call the tool to create a directory
+        result = await mcp_session.call_tool(
+            "create-directory",
+            {
+                "path": test_dir,
+            },
+        )
 
-            # Call the tool to create a directory
-            result = await session.call_tool(
-                "create-directory",
-                {
-                    "path": test_dir,
-                },
-            )
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
 
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
-
-            # Check that the call was successful
-            assert "Directory created successfully" in result_text or "created successfully" in result_text  # noqa: E501
+        # Check that the call was successful
+        assert "created successfully" in result_text
 
-            # Verify the directory exists
-            assert os.path.exists(test_dir)
-            assert os.path.isdir(test_dir)
+        # Verify the directory exists
+        assert os.path.exists(test_dir)
+        assert os.path.isdir(test_dir)
 
     async def test_create_nested_directory(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a nested directory structure."""
         # Define a nested directory path
         nested_dir = os.path.join(temp_test_directory, "nested", "multi", "level", "directory")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
+        # Call the tool to create a nested directory structure
+        result = await mcp_session.call_tool(
+            "create-directory",
+            {
+                "path": nested_dir,
+            },
+        )
 
-            # Call the tool to create a nested directory structure
-            result = await session.call_tool(
-                "create-directory",
-                {
-                    "path": nested_dir,
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
 
-            # Check that the call was successful
-            assert "Directory created successfully" in result_text or "created successfully" in result_text  # noqa: E501
+        # Check that the call was successful
+        assert "created successfully" in result_text
 
-            # Verify the directory exists
-            assert os.path.exists(nested_dir)
-            assert os.path.isdir(nested_dir)
+        # Verify the directory exists
+        assert os.path.exists(nested_dir)
+        assert os.path.isdir(nested_dir)
 
-            # Verify parent directories were also created
-            parent_dir = os.path.join(temp_test_directory, "nested", "multi", "level")
-            assert os.path.exists(parent_dir)
-            assert os.path.isdir(parent_dir)
+        # Verify parent directories were also created
+        parent_dir = os.path.join(temp_test_directory, "nested", "multi", "level")
+        assert os.path.exists(parent_dir)
+        assert os.path.isdir(parent_dir)
 
     async def test_create_directory_that_already_exists(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
         temp_test_directory: str,
     ):
         """Test creating a directory that already exists."""
@@ -626,27 +506,21 @@ class TestCreateDirectory:
         with open(marker_file, "w") as f:  # noqa: ASYNC230
             f.write("This is a marker file")
 
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool to create the same directory
-            result = await session.call_tool(
-                "create-directory",
-                {
-                    "path": existing_dir,
-                },
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-            assert 'Error' not in result_text
+        # Call the tool to create the same directory
+        result = await mcp_session.call_tool(
+            "create-directory",
+            {
+                "path": existing_dir,
+            },
+        )
 
-            # The operation should succeed (mkdir -p is idempotent)
-            assert "Directory created successfully" in result_text or "created successfully" in result_text  # noqa: E501
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert 'Error' not in result_text
 
-            # The marker file should still exist
-            assert os.path.exists(marker_file)
+        # The operation should succeed (mkdir -p is idempotent)
+        assert "created successfully" in result_text
 
+        # The marker file should still exist
+        assert os.path.exists(marker_file)
@@ -1,13 +1,30 @@
 """Unit tests for the GitHub configuration tools."""
+import asyncio
 import os
+import re
 import pytest
+import yaml
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import Tool
+from mcp_this.__main__ import get_preset_config
 import subprocess
 import tempfile
 
+# Errors the pull request info tool reports when gh is missing, unauthenticated, or can't
+# find the pull request
+GH_ERRORS = (
+    "GitHub CLI (gh) is not installed",
+    "gh: command not found",
+    "You must authenticate",
+    "could not find",
+    "Not Found",
+)
+# Sections of the pull request info tool's output when gh fetches the pull request
+PR_SECTIONS = ("=== PR Overview ===", "=== Files Changed", "=== File Changes ===")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def server_params() -> StdioServerParameters:
     """Create server parameters with GitHub configuration."""
     return StdioServerParameters(
@@ -16,343 +33,236 @@ def server_params() -> StdioServerParameters:
     )
 
 
+@pytest.fixture(scope="module")
+def pr_info_tool(tools_by_name: dict[str, Tool]) -> Tool:
+    """Get the get-github-pull-request-info tool from the module's cached tool list."""
+    return tools_by_name["get-github-pull-request-info"]
+
+
 @pytest.mark.skipif(os.getenv("CI") == "true", reason="GitHub CLI not available in CI")
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 class TestGetGithubPullRequestInfo:
     """Test the get-github-pull-request-info tool from the GitHub configuration."""
 
-    async def test_tool_registration(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_tool_registration(self, tools_by_name: dict[str, Tool]):
         """Test that the get-github-pull-request-info tool is properly registered."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
+        # Verify tool exists
+        assert "get-github-pull-request-info" in tools_by_name
 
-            # Verify tool exists
-            tool_names = [t.name for t in tools.tools]
-            assert "get-github-pull-request-info" in tool_names
+        # Get the tool details
+        pr_info_tool = tools_by_name["get-github-pull-request-info"]
 
-            # Get the tool details
-            pr_info_tool = next(t for t in tools.tools if t.name == "get-github-pull-request-info")
+        # Check tool schema has the expected parameters
+        assert "pr_url" in pr_info_tool.inputSchema["properties"]
 
-            # Check tool schema has the expected parameters
-            assert "pr_url" in pr_info_tool.inputSchema["properties"]
+        # Verify required parameters
+        assert "required" in pr_info_tool.inputSchema
+        assert "pr_url" in pr_info_tool.inputSchema["required"]
 
-            # Verify required parameters
-            assert "required" in pr_info_tool.inputSchema
-            assert "pr_url" in pr_info_tool.inputSchema["required"]
-
-            # Check that the description mentions comprehensive PR information
-            assert "comprehensive" in pr_info_tool.description.lower()
-            assert "pull request" in pr_info_tool.description.lower()
+        # Check that the description mentions comprehensive PR information
+        assert "comprehensive" in pr_info_tool.description.lower()
+        assert "pull request" in pr_info_tool.description.lower()
 
     async def test_valid_pr_url_format(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test the get-github-pull-request-info tool with a valid PR URL format."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Call the tool with the specific test PR URL mentioned by the user
-            result = await session.call_tool(
-                "get-github-pull-request-info",
-                {"pr_url": "https://github.com/shane-kercheval/mcp-this/pull/2"},
-            )
-
-            # Verify we got some output
-            assert result.content
-            result_text = result.content[0].text
-
-            # The result might be an error if gh CLI is not installed/authenticated,
-            # but we can verify the URL format processing worked
-            assert isinstance(result_text, str)
-            assert len(result_text) > 0
-
-            # If gh CLI is available and authenticated, we expect structured output
-            if "Error: GitHub CLI (gh) is not installed" not in result_text and \
-               "gh: command not found" not in result_text and \
-               "Error: You must authenticate" not in result_text:
-
-                # Check for expected output sections
-                expected_sections = ["=== PR Overview ===", "=== Files Changed", "=== File Changes ==="]  # noqa: E501
-                for section in expected_sections:
-                    if section in result_text:
-                        # At least one section should be present if gh works
-                        break
-                else:
-                    # If none of the sections are found, it might be an error
-                    # This is acceptable for testing since gh CLI might not be set up
-                    pass
+        # Call the tool with the specific test PR URL mentioned by the user
+        result = await mcp_session.call_tool(
+            "get-github-pull-request-info",
+            {"pr_url": "https://github.com/shane-kercheval/mcp-this/pull/2"},
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+
+        # The result might be an error if gh CLI is not installed/authenticated,
+        # but we can verify the URL format processing worked
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
+
+        # If gh CLI is available and authenticated, we expect structured output
+        if "Error: GitHub CLI (gh) is not installed" not in result_text and \
+           "gh: command not found" not in result_text and \
+           "Error: You must authenticate" not in result_text:
+
+            # Check for expected output sections
+            for section in PR_SECTIONS:
+                if section in result_text:
+                    # At least one section should be present if gh works
+                    break
+            else:
+                # If none of the sections are found, it might be an error
+                # This is acceptable for testing since gh CLI might not be set up
+                pass
 
     async def test_invalid_pr_url_format(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
-        """Test the get-github-pull-request-info tool with invalid URL formats."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            invalid_urls = [
-                "https://github.com/owner/repo",  # No pull request path
-                "https://github.com/owner/repo/issues/123",  # Issue, not PR
-                "https://gitlab.com/owner/repo/merge_requests/123",  # Different platform
-                "not-a-url-at-all",  # Not a URL
-                "https://github.com/owner",  # Incomplete URL
-                "https://github.com/owner/repo/pull/",  # Missing PR number
-                "https://github.com/owner/repo/pull/abc",  # Non-numeric PR number
-            ]
-
-            for invalid_url in invalid_urls:
-                result = await session.call_tool(
-                    "get-github-pull-request-info",
-                    {"pr_url": invalid_url},
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
+        """Test that the tool reports an invalid URL; the regex itself is in TestPrUrlPattern."""
+        result = await mcp_session.call_tool(
+            "get-github-pull-request-info",
+            {"pr_url": "https://github.com/owner/repo/issues/123"},
+        )
 
-                # Should get an error message about invalid URL format
-                assert "Invalid GitHub PR URL format" in result_text or \
-                       "Error:" in result_text
-                assert isinstance(result_text, str)
-                assert len(result_text) > 0
+        assert result.content
+        assert "Invalid GitHub PR URL format" in result.content[0].text
 
     async def test_pr_url_parsing_regex(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
         """Test that the regex correctly parses different valid GitHub PR URL formats."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            valid_urls = [
-                "https://github.com/microsoft/vscode/pull/12345",
-                "https://github.com/facebook/react/pull/6789",
-                "https://github.com/your-org/your-repo/pull/42",
-                "https://github.com/shane-kercheval/mcp-this/pull/2",
-                "https://github.com/owner-name/repo-name/pull/1",
-                "https://github.com/org123/repo123/pull/999999",
-            ]
-
-            for valid_url in valid_urls:
-                result = await session.call_tool(
-                    "get-github-pull-request-info",
-                    {"pr_url": valid_url},
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-
-                # Should not get URL format error
-                assert "Invalid GitHub PR URL format" not in result_text
-                assert isinstance(result_text, str)
-                assert len(result_text) > 0
-
-                # If gh CLI is not available, we expect a specific error message
-                # If it is available, we expect either PR data or authentication error
-                expected_errors = [
-                    "GitHub CLI (gh) is not installed",
-                    "gh: command not found",
-                    "You must authenticate",
-                    "could not find",
-                    "Not Found",
-                ]
-
-                is_gh_error = any(error in result_text for error in expected_errors)
-                has_pr_sections = any(section in result_text for section in
-                                    ["=== PR Overview ===", "=== Files Changed", "=== File Changes ==="])  # noqa: E501
-
-                # Either we get gh CLI errors or we get PR sections
-                assert is_gh_error or has_pr_sections or "Error" in result_text
-
-    async def test_tool_handles_gh_cli_missing(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test that the tool gracefully handles missing GitHub CLI."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Use a valid URL format but might fail due to missing gh CLI
-            result = await session.call_tool(
-                "get-github-pull-request-info",
-                {"pr_url": "https://github.com/microsoft/vscode/pull/12345"},
-            )
-
+        valid_urls = [
+            "https://github.com/microsoft/vscode/pull/12345",
+            "https://github.com/facebook/react/pull/6789",
+            "https://github.com/your-org/your-repo/pull/42",
+            "https://github.com/shane-kercheval/mcp-this/pull/2",
+            "https://github.com/owner-name/repo-name/pull/1",
+            "https://github.com/org123/repo123/pull/999999",
+        ]
+
+        results = await asyncio.gather(*(
+            mcp_session.call_tool("get-github-pull-request-info", {"pr_url": valid_url})
+            for valid_url in valid_urls
+        ))
+
+        for result in results:
             # Verify we got some output
             assert result.content
             result_text = result.content[0].text
+
+            # Should not get URL format error
+            assert "Invalid GitHub PR URL format" not in result_text
             assert isinstance(result_text, str)
             assert len(result_text) > 0
 
-            # The tool should either work (if gh is installed) or give a meaningful error
-            # We don't assert specific content since it depends on the environment
-            # But we ensure it doesn't crash and returns something
+            # If gh CLI is not available, we expect a specific error message
+            # If it is available, we expect either PR data or authentication error
+            is_gh_error = any(error in result_text for error in GH_ERRORS)
+            has_pr_sections = any(section in result_text for section in PR_SECTIONS)
+
+            # Either we get gh CLI errors or we get PR sections
+            assert is_gh_error or has_pr_sections or "Error" in result_text
 
-    async def test_tool_description_and_examples(
+    async def test_tool_handles_gh_cli_missing(
         self,
-        server_params: StdioServerParameters,
+        mcp_session: ClientSession,
     ):
+        """Test that the tool gracefully handles missing GitHub CLI."""
+        # Use a valid URL format but might fail due to missing gh CLI
+        result = await mcp_session.call_tool(
+            "get-github-pull-request-info",
+            {"pr_url": "https://github.com/microsoft/vscode/pull/12345"},
+        )
+
+        # Verify we got some output
+        assert result.content
+        result_text = result.content[0].text
+        assert isinstance(result_text, str)
+        assert len(result_text) > 0
+
+        # The tool should either work (if gh is installed) or give a meaningful error
+        # We don't assert specific content since it depends on the environment
+        # But we ensure it doesn't crash and returns something
+
+    async def test_tool_description_and_examples(self, pr_info_tool: Tool):
         """Test that the tool description contains expected information and examples."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-            tools = await session.list_tools()
+        # Check that description contains key information
+        description = pr_info_tool.description.lower()
 
-            # Get the tool details
-            pr_info_tool = next(t for t in tools.tools if t.name == "get-github-pull-request-info")
+        # Should mention comprehensive information
+        assert "comprehensive" in description
+        assert "pull request" in description
 
-            # Check that description contains key information
-            description = pr_info_tool.description.lower()
+        # Should mention key features
+        expected_features = ["overview", "files changed", "diff"]
+        for feature in expected_features:
+            assert feature in description
 
-            # Should mention comprehensive information
-            assert "comprehensive" in description
-            assert "pull request" in description
+        # Should contain examples
+        assert "examples:" in description
 
-            # Should mention key features
-            expected_features = ["overview", "files changed", "diff"]
-            for feature in expected_features:
-                assert feature in description
+        # Should mention specific outputs
+        expected_outputs = ["title", "description", "status", "metadata"]
+        for output in expected_outputs:
+            assert output in description
 
-            # Should contain examples
-            assert "examples:" in description
-
-            # Should mention specific outputs
-            expected_outputs = ["title", "description", "status", "metadata"]
-            for output in expected_outputs:
-                assert output in description
-
-    async def test_parameter_validation(
-        self,
-        server_params: StdioServerParameters,
-    ):
+    async def test_parameter_validation(self, pr_info_tool: Tool):
         """Test parameter validation for the get-github-pull-request-info tool."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Test with missing required parameter - this should be handled by the MCP framework
-            # The exact behavior depends on the MCP implementation, but typically it would
-            # return an error about missing required parameters before our tool is even called
-
-            # We can verify the tool schema indicates pr_url is required
-            tools = await session.list_tools()
-            pr_info_tool = next(t for t in tools.tools if t.name == "get-github-pull-request-info")
-
-            # Verify the schema correctly marks pr_url as required
-            assert "pr_url" in pr_info_tool.inputSchema["required"]
-            assert len(pr_info_tool.inputSchema["required"]) == 1  # Only pr_url should be required
-
-    async def test_different_github_domains(
-        self,
-        server_params: StdioServerParameters,
+        # Test with missing required parameter - this should be handled by the MCP framework
+        # The exact behavior depends on the MCP implementation, but typically it would
+        # return an error about missing required parameters before our tool is even called
+
+        # We can verify the tool schema indicates pr_url is required
+        # Verify the schema correctly marks pr_url as required
+        assert "pr_url" in pr_info_tool.inputSchema["required"]
+        assert len(pr_info_tool.inputSchema["required"]) == 1  # Only pr_url should be required
+
+
+@pytest.fixture(scope="module")
+def pr_url_re() -> re.Pattern:
+    r"""
+    Get the pattern get-github-pull-request-info uses to validate and split the PR URL.
+
+    The pattern is read from the preset's bash `[[ "$PR_URL" =~ ... ]]` test, so the tests
+    check the pattern the tool actually runs. bash matches it as a POSIX extended regex while
+    these tests use Python's re, so the pattern must stay within the syntax both share: no lazy
+    quantifiers, lookarounds, backslash classes such as `\d`, or classes like `[[:digit:]]`.
+    """
+    with open(get_preset_config("github")) as f:
+        tool = yaml.safe_load(f)["tools"]["get-github-pull-request-info"]
+    command = tool["execution"]["command"]
+    match = re.search(r'=~ (\S+) \]\]', command)
+    assert match, "PR URL pattern not found in github preset"
+    return re.compile(match.group(1))
+
+
+def parse_pr_url(pr_url_re: re.Pattern, url: str) -> tuple[str, str, str] | None:
+    """Return (owner, repo, number) if the github preset accepts the PR URL, otherwise None."""
+    # bash's =~ is unanchored, like re.search
+    match = pr_url_re.search(url)
+    return match.groups() if match else None
+
+
+class TestPrUrlPattern:
+    """Test the PR URL pattern of get-github-pull-request-info without running the tool."""
+
+    @pytest.mark.parametrize("url", [
+        "https://github.com/owner/repo",  # No pull request path
+        "https://github.com/owner/repo/issues/123",  # Issue, not PR
+        "https://gitlab.com/owner/repo/merge_requests/123",  # Different platform
+        "not-a-url-at-all",  # Not a URL
+        "https://github.com/owner",  # Incomplete URL
+        "https://github.com/owner/repo/pull/",  # Missing PR number
+        "https://github.com/owner/repo/pull/abc",  # Non-numeric PR number
+        # Only github.com is supported, not GitHub Enterprise domains
+        "https://github.enterprise.com/owner/repo/pull/123",
+        "https://git.company.com/owner/repo/pull/123",
+        "https://github-enterprise.example.com/owner/repo/pull/123",
+        # The domain is case-sensitive
+        "https://GITHUB.COM/owner/repo/pull/123",
+        "https://GitHub.com/owner/repo/pull/123",
+    ])
+    def test_invalid_pr_url(self, pr_url_re: re.Pattern, url: str):
+        """Test that URLs which are not github.com pull requests are rejected."""
+        assert parse_pr_url(pr_url_re, url) is None
+
+    @pytest.mark.parametrize(("url", "expected"), [
+        ("https://github.com/OWNER/REPO/pull/123", ("OWNER", "REPO", "123")),
+        ("https://github.com/owner/repo/pull/1", ("owner", "repo", "1")),
+        ("https://github.com/owner/repo/pull/999999999", ("owner", "repo", "999999999")),
+        # Zero is invalid in practice but a valid format
+        ("https://github.com/owner/repo/pull/0", ("owner", "repo", "0")),
+    ])
+    def test_valid_pr_url(
+        self, pr_url_re: re.Pattern, url: str, expected: tuple[str, str, str],
     ):
-        """Test the tool with different GitHub domains (should only work with github.com)."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # Test with GitHub Enterprise URLs - these should be rejected by the regex
-            enterprise_urls = [
-                "https://github.enterprise.com/owner/repo/pull/123",
-                "https://git.company.com/owner/repo/pull/123",
-                "https://github-enterprise.example.com/owner/repo/pull/123",
-            ]
-
-            for enterprise_url in enterprise_urls:
-                result = await session.call_tool(
-                    "get-github-pull-request-info",
-                    {"pr_url": enterprise_url},
-                )
-
-                # Verify we got some output
-                assert result.content
-                result_text = result.content[0].text
-
-                # Should get an error message about invalid URL format
-                # since the regex specifically looks for github.com
-                assert "Invalid GitHub PR URL format" in result_text
-                assert isinstance(result_text, str)
-                assert len(result_text) > 0
-
-    async def test_case_sensitivity(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test URL parsing with different case variations."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            # GitHub URLs should be case-sensitive for the domain
-            case_variations = [
-                "https://GITHUB.COM/owner/repo/pull/123",  # Uppercase domain - should fail
-                "https://GitHub.com/owner/repo/pull/123",  # Mixed case domain - should fail
-                "https://github.com/OWNER/REPO/pull/123",  # Uppercase owner/repo - should work
-            ]
-
-            for i, url in enumerate(case_variations):
-                result = await session.call_tool(
-                    "get-github-pull-request-info",
-                    {"pr_url": url},
-                )
-
-                assert result.content
-                result_text = result.content[0].text
-
-                if i < 2:  # First two should fail due to domain case
-                    assert "Invalid GitHub PR URL format" in result_text
-                else:  # Last one should pass URL validation (though may fail on gh CLI call)
-                    assert "Invalid GitHub PR URL format" not in result_text
-
-    async def test_edge_case_pr_numbers(
-        self,
-        server_params: StdioServerParameters,
-    ):
-        """Test with edge case PR numbers."""
-        async with stdio_client(server_params) as (read, write), ClientSession(
-            read, write,
-        ) as session:
-            await session.initialize()
-
-            edge_cases = [
-                "https://github.com/owner/repo/pull/1",  # Minimum valid PR number
-                "https://github.com/owner/repo/pull/999999999",  # Very large PR number
-                "https://github.com/owner/repo/pull/0",  # Zero (invalid in practice but valid format)  # noqa: E501
-            ]
-
-            for url in edge_cases:
-                result = await session.call_tool(
-                    "get-github-pull-request-info",
-                    {"pr_url": url},
-                )
-
-                assert result.content
-                result_text = result.content[0].text
-
-                # URL format should be valid for all these cases
-                assert "Invalid GitHub PR URL format" not in result_text
-                assert isinstance(result_text, str)
-                assert len(result_text) > 0
+        """Test that github.com pull request URLs are split into owner, repo, and number."""
+        assert parse_pr_url(pr_url_re, url) == expected
 
 
 class GitTestRepo:
@@ -1,9 +1,12 @@
 """Edge case tests for command execution in mcp_this."""
+import asyncio
 import os
+import time
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
+from mcp_this import tools as tools_module
 from mcp_this.tools import execute_command, build_command
 
 
@@ -28,20 +31,21 @@ class TestCommandExecutionEdgeCases:
 
     @pytest.mark.asyncio
     async def test_execute_with_timeout(self):
-        """Test executing a command that takes too long."""
-        # Create a command that sleeps for 5 seconds
-        with patch('asyncio.create_subprocess_shell') as mock_create_subprocess:
-            # Setup mock process
-            mock_process = MagicMock()
-            mock_process.communicate.side_effect = TimeoutError()
-            mock_create_subprocess.return_value = mock_process
-
-            # Execute with timeout
-            with patch('asyncio.wait_for', side_effect=TimeoutError()):
-                result = await execute_command("sleep 5")
-
-            # Should contain an error message
-            assert "Error:" in result
+        """Test executing a command whose wait for the process times out."""
+        # Setup mock process whose output streams are empty and whose wait times out
+        mock_process = MagicMock()
+        mock_process.stdout.read = AsyncMock(return_value=b"")
+        mock_process.stderr.read = AsyncMock(return_value=b"")
+        mock_process.wait = AsyncMock(side_effect=TimeoutError("timed out"))
+        with patch('asyncio.create_subprocess_shell', new=AsyncMock(return_value=mock_process)), \
+                patch('asyncio.create_subprocess_exec', new=AsyncMock(return_value=mock_process)):
+            result = await execute_command("sleep 5")
+
+        # The output was drained before the wait timed out, and the timeout is reported
+        mock_process.stdout.read.assert_awaited()
+        mock_process.stderr.read.assert_awaited()
+        mock_process.wait.assert_awaited_once()
+        assert result == "Error: timed out"
 
 
     @pytest.mark.asyncio
@@ -66,6 +70,94 @@ class TestCommandExecutionEdgeCases:
         assert "test line" in result
         assert len(result) > 100000  # Should be quite large
 
+    @pytest.mark.asyncio
+    async def test_execute_with_multibyte_char_across_chunks(self):
+        """Test that a multibyte character split across read chunks is decoded correctly."""
+        # 65535 single-byte chars push the first 2-byte 'é' across the 64 KiB read boundary
+        command = "python3 -c \"import sys; sys.stdout.write('a' * 65535 + 'é' * 10)\""
+
+        result = await execute_command(command)
+
+        assert result == "a" * 65535 + "é" * 10
+
+    @pytest.mark.asyncio
+    async def test_simple_command_runs_without_shell(self):
+        """Test that a command with no shell syntax is executed directly."""
+        with patch('asyncio.create_subprocess_shell') as mock_shell:
+            result = await execute_command("printenv HOME")
+
+        mock_shell.assert_not_called()
+        assert result.strip() == os.environ["HOME"]
+
+    @pytest.mark.asyncio
+    async def test_shell_syntax_and_builtins_use_shell(self):
+        """Test that commands needing shell features still run through the shell."""
+        assert await execute_command("echo one | tr a-z A-Z") == "ONE\n"
+        assert await execute_command("GREETING=hi printenv GREETING") == "hi\n"
+        assert await execute_command("cd / && pwd") == "/\n"
+
+    @pytest.mark.asyncio
+    async def test_execute_respects_max_concurrency(self):
+        """Test that MCP_THIS_MAX_CONCURRENCY limits how many commands are started at once."""
+        starting = 0
+        most_starting = 0
+
+        async def slow_spawn(cmd: str) -> asyncio.subprocess.Process:
+            nonlocal starting, most_starting
+            starting += 1
+            most_starting = max(most_starting, starting)
+            await asyncio.sleep(0.05)
+            starting -= 1
+            return await real_spawn(cmd)
+
+        real_spawn = tools_module._spawn
+        with patch.dict(os.environ, {"MCP_THIS_MAX_CONCURRENCY": "1"}), \
+                patch.object(tools_module, "_spawn", side_effect=slow_spawn):
+            results = await asyncio.gather(*(execute_command("echo hi") for _ in range(3)))
+
+        assert results == ["hi\n", "hi\n", "hi\n"]
+        # The commands were started one after another rather than in parallel
+        assert most_starting == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_command_does_not_block_others(self):
+        """Test that a running command doesn't hold an MCP_THIS_MAX_CONCURRENCY slot."""
+        with patch.dict(os.environ, {"MCP_THIS_MAX_CONCURRENCY": "1"}):
+            start = time.monotonic()
+            slow = asyncio.create_task(execute_command("sleep 1"))
+            await asyncio.sleep(0.1)
+            assert await execute_command("echo hi") == "hi\n"
+            elapsed = time.monotonic() - start
+            assert await slow == ""
+
+        # The second command didn't wait for the first one to finish
+        assert elapsed < 1
+
+    @pytest.mark.parametrize(("cpu_max", "expected"), [
+        ("150000 100000\n", 2),  # A quota of 1.5 CPUs is rounded up
+        ("50000 100000\n", 1),  # Less than one CPU still allows one command
+        ("max 100000\n", None),  # No quota
+        ("", None),  # Unreadable
+    ], ids=["fractional", "below-one", "unlimited", "malformed"])
+    def test_cgroup_cpu_limit(self, tmp_path: Path, cpu_max: str, expected: int | None):
+        """Test that the cgroup v2 cpu.max quota is converted to a whole number of CPUs."""
+        cpu_max_file = tmp_path / "cpu.max"
+        cpu_max_file.write_text(cpu_max)
+        with patch.object(tools_module, "_CGROUP_CPU_MAX", cpu_max_file):
+            assert tools_module._cgroup_cpu_limit() == expected
+
+    def test_max_concurrency_honors_cgroup_quota(self, tmp_path: Path):
+        """Test that the default concurrency is capped by the cgroup CPU quota."""
+        cpu_max_file = tmp_path / "cpu.max"
+        cpu_max_file.write_text("100000 100000\n")
+        with patch.dict(os.environ, {"MCP_THIS_MAX_CONCURRENCY": ""}), \
+                patch.object(tools_module, "_CGROUP_CPU_MAX", cpu_max_file):
+            assert tools_module.max_concurrency() == 1
+        # A missing cpu.max (e.g. cgroup v1 or no cgroup) leaves the CPU set count
+        with patch.dict(os.environ, {"MCP_THIS_MAX_CONCURRENCY": ""}), \
+                patch.object(tools_module, "_CGROUP_CPU_MAX", tmp_path / "missing"):
+            assert tools_module.max_concurrency() >= 1
+
     @pytest.mark.asyncio
     async def test_execute_with_binary_output(self):
         """Test executing a command that produces binary output."""
@@ -188,3 +280,23 @@ class TestBuildCommandEdgeCases:
 
         # Should preserve all special characters
         assert result == "test value with $ & | ; < > ( ) \" ' \\"
+
+    def test_build_command_with_placeholder_in_value(self):
+        """Test that placeholder-like text inside a parameter value is not substituted."""
+        template = "echo <<first>> <<second>>"
+        parameters = {"first": "<<second>>", "second": "value"}
+
+        result = build_command(template, parameters)
+
+        # The value of 'first' is inserted verbatim
+        assert result == "echo <<second>> value"
+
+    def test_build_command_without_placeholders(self):
+        """Test building a command from a template that has no placeholders."""
+        template = "ls   -la\n    /tmp"
+
+        assert build_command(template, {}) == "ls -la /tmp"
+        # Empty values are ignored, but a real value has nowhere to go
+        assert build_command(template, {"flags": ""}) == "ls -la /tmp"
+        with pytest.raises(ValueError, match="Placeholder '<<flags>>' not found"):
+            build_command(template, {"flags": "-h"})
@@ -1,62 +1,113 @@
 """Unit tests for the __main__ module."""
 import os
-from unittest.mock import patch
-from mcp_this.__main__ import main
+import sys
+import pytest
+from unittest.mock import MagicMock, patch
+from mcp_this.__main__ import main, serve, uvloop_loop_factory
 
 class TestFindDefaultConfig:
     """Test cases for the find_default_config function."""
 
 
 
+class TestUvloopLoopFactory:
+    """Test cases for the uvloop_loop_factory function."""
+
+    @patch('sys.platform', 'linux')
+    def test_uvloop_not_available(self):
+        """Test that the default event loop is used when uvloop is not installed."""
+        with patch.dict(sys.modules, {'uvloop': None}):
+            assert uvloop_loop_factory() is None
+
+    @patch('sys.platform', 'linux')
+    def test_uvloop_available(self):
+        """Test that uvloop's event loop factory is used when uvloop is available."""
+        mock_uvloop = MagicMock()
+        with patch.dict(sys.modules, {'uvloop': mock_uvloop}):
+            assert uvloop_loop_factory() is mock_uvloop.new_event_loop
+        mock_uvloop.install.assert_not_called()
+
+    @patch('sys.platform', 'win32')
+    def test_uvloop_not_used_on_windows(self):
+        """Test that uvloop is never used on Windows, which it doesn't support."""
+        with patch.dict(sys.modules, {'uvloop': MagicMock()}):
+            assert uvloop_loop_factory() is None
+
+
+class TestServe:
+    """Test cases for the serve function."""
+
+    @pytest.mark.parametrize(('transport', 'method'), [
+        ('stdio', 'run_stdio_async'),
+        ('sse', 'run_sse_async'),
+        ('streamable-http', 'run_streamable_http_async'),
+    ])
+    @patch('mcp_this.__main__.anyio.run')
+    @patch('mcp_this.__main__.mcp')
+    def test_serve_runs_transport_with_loop_factory(
+        self, mock_mcp, mock_run, transport, method,  # noqa: ANN001
+    ):
+        """Test that serve runs the transport's server on the uvloop loop factory."""
+        loop_factory = MagicMock()
+        with patch('mcp_this.__main__.uvloop_loop_factory', return_value=loop_factory):
+            serve(transport)
+
+        mock_run.assert_called_once_with(
+            getattr(mock_mcp, method), backend_options={'loop_factory': loop_factory},
+        )
+
+
 class TestMain:
     """Test cases for the main function."""
 
     @patch('mcp_this.__main__.init_server')
-    @patch('mcp_this.__main__.mcp')
+    @patch('mcp_this.__main__.serve')
     @patch('sys.argv', ['mcp-this', '--config-path', '/path/to/config.yaml'])
-    def test_main_with_config_path(self, mock_mcp, mock_init_server):  # noqa: ANN001
+    def test_main_with_config_path(self, mock_serve, mock_init_server):  # noqa: ANN001
         """Test main function with config-path argument."""
         # Run the main function
         main()
 
         # Check that init_server was called with the correct arguments
         mock_init_server.assert_called_once_with(config_path='/path/to/config.yaml', tools=None)
-        # Check that mcp.run was called
-        mock_mcp.run.assert_called_once_with(transport='stdio')
+        # Check that the server was run
+        mock_serve.assert_called_once_with('stdio')
 
     @patch('mcp_this.__main__.init_server')
-    @patch('mcp_this.__main__.mcp')
+    @patch('mcp_this.__main__.serve')
     @patch('sys.argv', ['mcp-this', '--config-value', '{"tools": {}}'])
-    def test_main_with_tools_json(self, mock_mcp, mock_init_server):  # noqa: ANN001
+    def test_main_with_tools_json(self, mock_serve, mock_init_server):  # noqa: ANN001
         """Test main function with config-value JSON argument."""
         # Run the main function
         main()
 
         # Check that init_server was called with the correct arguments
         mock_init_server.assert_called_once_with(config_path=None, tools='{"tools": {}}')
-        # Check that mcp.run was called
-        mock_mcp.run.assert_called_once_with(transport='stdio')
+        # Check that the server was run
+        mock_serve.assert_called_once_with('stdio')
 
     @patch('mcp_this.__main__.init_server')
-    @patch('mcp_this.__main__.mcp')
+    @patch('mcp_this.__main__.serve')
     @patch('sys.argv', ['mcp-this'])
     @patch.dict(os.environ, {'MCP_THIS_CONFIG_PATH': '/env/path/config.yaml'})
-    def test_main_with_env_var(self, mock_mcp, mock_init_server):  # noqa: ANN001
+    def test_main_with_env_var(self, mock_serve, mock_init_server):  # noqa: ANN001
         """Test main function with environment variable."""
         # Run the main function
         main()
 
         # Check that init_server was called with the correct arguments
         mock_init_server.assert_called_once_with(config_path='/env/path/config.yaml', tools=None)
-        # Check that mcp.run was called
-        mock_mcp.run.assert_called_once_with(transport='stdio')
+        # Check that the server was run
+        mock_serve.assert_called_once_with('stdio')
 
     @patch('mcp_this.__main__.find_default_config')
     @patch('mcp_this.__main__.init_server')
-    @patch('mcp_this.__main__.mcp')
+    @patch('mcp_this.__main__.serve')
     @patch('sys.argv', ['mcp-this'])
     @patch.dict(os.environ, {}, clear=True)  # Clear environment variables
-    def test_main_with_default_config(self, mock_mcp, mock_init_server, mock_find_default_config):  # noqa: ANN001
+    def test_main_with_default_config(
+        self, mock_serve, mock_init_server, mock_find_default_config,  # noqa: ANN001
+    ):
         """Test main function with default config."""
         # Mock find_default_config to return a path
         mock_find_default_config.return_value = '/default/config.yaml'
@@ -66,22 +117,22 @@ class TestMain:
 
         # Check that init_server was called with the correct arguments
         mock_init_server.assert_called_once_with(config_path='/default/config.yaml', tools=None)
-        # Check that mcp.run was called
-        mock_mcp.run.assert_called_once_with(transport='stdio')
+        # Check that the server was run
+        mock_serve.assert_called_once_with('stdio')
 
 
     @patch('mcp_this.__main__.init_server')
-    @patch('mcp_this.__main__.mcp')
+    @patch('mcp_this.__main__.serve')
     @patch('sys.argv', ['mcp-this', '--transport', 'sse', '--config-path', '/path/to/config.yaml'])
-    def test_main_custom_transport(self, mock_mcp, mock_init_server):  # noqa: ANN001
+    def test_main_custom_transport(self, mock_serve, mock_init_server):  # noqa: ANN001
         """Test main function with custom transport."""
         # Run the main function
         main()
 
         # Check that init_server was called with the correct arguments
         mock_init_server.assert_called_once_with(config_path='/path/to/config.yaml', tools=None)
-        # Check that mcp.run was called with the custom transport
-        mock_mcp.run.assert_called_once_with(transport='sse')
+        # Check that the server was run with the custom transport
+        mock_serve.assert_called_once_with('sse')
 
     @patch('mcp_this.__main__.init_server')
     @patch('sys.argv', ['mcp-this', '--config-path', '/path/to/config.yaml'])
@@ -98,3 +149,19 @@ class TestMain:
         # Check that sys.exit was called with code 1
         mock_exit.assert_called_once_with(1)
 
+    @pytest.mark.parametrize('value', ['zero', '0', '-1', '1.5', '²'])
+    @patch('mcp_this.__main__.serve')
+    @patch('sys.argv', [
+        'mcp-this', '--config-value', '{"tools": {"tool": {"execution": {"command": "echo"}}}}',
+    ])
+    @patch('sys.exit')
+    def test_main_invalid_max_concurrency(self, mock_exit, mock_serve, value):  # noqa: ANN001
+        """Test that an invalid MCP_THIS_MAX_CONCURRENCY stops the server at startup."""
+        with patch.dict(os.environ, {'MCP_THIS_MAX_CONCURRENCY': value}), \
+                patch('sys.stderr') as mock_stderr:
+            main()
+
+        mock_exit.assert_called_once_with(1)
+        mock_serve.assert_not_called()
+        written = "".join(call.args[0] for call in mock_stderr.write.call_args_list)
+        assert "MCP_THIS_MAX_CONCURRENCY must be a positive integer" in written
@@ -238,6 +238,14 @@ class TestBuildCommand:
         result = build_command(template, params)
         assert result == "echo Hello World"
 
+    def test_multiline_template_all_parameters_provided(self):
+        """Test that template whitespace is normalized even when no placeholder is removed."""
+        template = "echo <<message>> &&\n    echo   done\n"
+        params = {"message": "line1\n  line2"}
+        result = build_command(template, params)
+        # Template whitespace is collapsed but the parameter value is preserved as-is
+        assert result == "echo line1\n  line2 && echo done"
+
     def test_escaped_parameters(self):
         """Test handling of parameters with special characters that might need escaping."""
         template = "echo <<message>>"
@@ -560,9 +568,8 @@ class TestParseTools:
         tool = result[0]
         assert tool.parameters == {"name": {"description": "Your name", "required": False}}
         assert tool.param_string == "name: str = ''"
-        assert "params['name'] = name" in tool.exec_code
         assert "command_template" in tool.runtime_info
-        assert tool.runtime_info["parameters"] == ["name"]
+        assert tool.parameter_names == ("name",)
 
     def test_tool_with_required_parameters(self):
         """Test parsing a tool with required parameters."""
@@ -680,6 +687,8 @@ class TestParseTools:
         assert "A simple test tool" in desc
         assert "COMMAND CALLED:" in desc
         assert "`echo Test`" in desc
+        # The description is built once and reused on later calls
+        assert tool.get_full_description() is desc
 
     def test_get_full_description_with_parameters(self):
         """Test get_full_description for a tool with parameters."""
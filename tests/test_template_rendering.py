@@ -1,6 +1,7 @@
 """Unit tests for template rendering functionality in prompts."""
+import inspect
 from mcp_this.prompts import parse_prompts
-from mcp_this.mcp_server import render_template
+from mcp_this.mcp_server import create_prompt_handler, render_template
 
 
 class TestTemplateRendering:
@@ -336,3 +337,34 @@ class TestPromptIntegration:
         assert "{{#if formal}}" in prompt.template
         assert "{{else}}" in prompt.template
         assert "{{/if}}" in prompt.template
+
+    async def test_prompt_handler_renders_template(self):
+        """Test that the handler created for a prompt exposes its arguments and renders."""
+        config = {
+            "prompts": {
+                "greeting-prompt": {
+                    "description": "A conditional greeting prompt",
+                    "template": "{{#if formal}}Good day, {{name}}.{{else}}Hey {{name}}!{{/if}}",
+                    "arguments": {
+                        "formal": {
+                            "description": "Use formal greeting",
+                            "required": False,
+                        },
+                        "name": {
+                            "description": "Person's name",
+                            "required": True,
+                        },
+                    },
+                },
+            },
+        }
+
+        handler = create_prompt_handler(parse_prompts(config)[0])
+
+        # Required arguments come before optional ones
+        signature = inspect.signature(handler)
+        assert list(signature.parameters) == ["name", "formal"]
+        assert signature.parameters["formal"].default == ''
+
+        assert await handler(name="Ada") == "Hey Ada!"
+        assert await handler(name="Ada", formal="yes") == "Good day, Ada."
@@ -1,11 +1,12 @@
 """Unit tests for tool registration functions in mcp_server.py."""
+import inspect
 from unittest.mock import patch, MagicMock
 from mcp_this.mcp_server import (
     register_parsed_tools,
     register_tools,
     ToolInfo,
 )
-from mcp_this.tools import create_tool_info
+from mcp_this.tools import create_tool_handler, create_tool_info
 
 
 class TestRegisterTools:
@@ -81,18 +82,17 @@ class TestRegisterParsedTools:
         mock_decorator.assert_called_once()
 
     @patch('mcp_this.mcp_server.mcp')
-    @patch('builtins.exec')
-    def test_register_parsed_tools_exec_exception(self, mock_exec: MagicMock, mock_mcp: MagicMock) -> None:  # noqa: E501
-        """Test register_parsed_tools with exception during exec."""
+    @patch('mcp_this.mcp_server.create_tool_handler')
+    def test_register_parsed_tools_handler_exception(self, mock_create_handler: MagicMock, mock_mcp: MagicMock) -> None:  # noqa: E501
+        """Test register_parsed_tools with exception while creating the handler."""
         # Create a sample ToolInfo object
         tool_info = MagicMock(spec=ToolInfo)
-        tool_info.exec_code = "some invalid code"
         tool_info.function_name = "test_function"
         tool_info.tool_name = "test"
         tool_info.get_full_description.return_value = "Test description"
 
-        # Make exec raise an exception
-        mock_exec.side_effect = SyntaxError("Invalid syntax")
+        # Make handler creation raise an exception
+        mock_create_handler.side_effect = ValueError("Invalid parameter name")
 
         # Call register_parsed_tools with print_exc patched
         with patch('traceback.print_exc') as mock_print_exc:
@@ -103,6 +103,45 @@ class TestRegisterParsedTools:
         # Assert that mcp.tool was not called
         mock_mcp.tool.assert_not_called()
 
+    @patch('mcp_this.mcp_server.mcp')
+    def test_register_parsed_tools_handler_signature(self, mock_mcp: MagicMock) -> None:
+        """Test that the registered handler exposes the tool's parameters in its signature."""
+        tool_info = create_tool_info(
+            tool_name="list-files",
+            tool_config={
+                "description": "List files",
+                "execution": {
+                    "command": "ls <<flags>> <<directory>>",
+                },
+                "parameters": {
+                    "directory": {
+                        "description": "Directory to list",
+                        "required": True,
+                    },
+                    "flags": {
+                        "description": "Flags for ls",
+                        "required": False,
+                    },
+                },
+            },
+        )
+
+        mock_decorator = MagicMock()
+        mock_mcp.tool.return_value = mock_decorator
+
+        register_parsed_tools([tool_info])
+
+        handler = mock_decorator.call_args[0][0]
+        assert handler.__name__ == "list_files"
+        assert handler.__doc__ == "List files"
+        assert inspect.iscoroutinefunction(handler)
+        signature = inspect.signature(handler)
+        assert list(signature.parameters) == ["directory", "flags"]
+        assert signature.parameters["directory"].default is inspect.Parameter.empty
+        assert signature.parameters["flags"].default == ''
+        assert signature.parameters["flags"].annotation is str
+        assert signature.return_annotation is str
+
     @patch('mcp_this.mcp_server.mcp')
     def test_register_parsed_tools_multiple(self, mock_mcp: MagicMock) -> None:
         """Test register_parsed_tools with multiple tools."""
@@ -213,3 +252,48 @@ class TestToolRegistrationIntegration:
         tool_names = [kwargs["name"] for _, kwargs in mock_mcp.tool.call_args_list]
         assert "echo" in tool_names
         assert "read" in tool_names
+
+    def test_handlers_with_same_parameters_share_signature(self) -> None:
+        """Test that tools with identical parameters reuse one handler signature."""
+        tool_config = {
+            "execution": {"command": "cat <<file_path>>"},
+            "parameters": {"file_path": {"description": "Path to file", "required": True}},
+        }
+        other_config = {
+            "execution": {"command": "wc -l <<file_path>>"},
+            "parameters": {"file_path": {"description": "File to count", "required": True}},
+        }
+
+        handler = create_tool_handler(create_tool_info("read", tool_config))
+        other_handler = create_tool_handler(create_tool_info("count", other_config))
+
+        assert handler.__signature__ is other_handler.__signature__
+        assert handler.__name__ == "read"
+        assert other_handler.__name__ == "count"
+
+    async def test_registered_handler_runs_command(self) -> None:
+        """Test that the handler created for a tool builds and executes its command."""
+        tool_info = create_tool_info(
+            tool_name="echo",
+            tool_config={
+                "description": "Echo tool",
+                "execution": {
+                    "command": "echo <<message>> <<suffix>>",
+                },
+                "parameters": {
+                    "message": {
+                        "description": "Message to echo",
+                        "required": True,
+                    },
+                    "suffix": {
+                        "description": "Optional suffix",
+                        "required": False,
+                    },
+                },
+            },
+        )
+
+        handler = create_tool_handler(tool_info)
+
+        assert (await handler(message="hello")).strip() == "hello"
+        assert (await handler(message="hello", suffix="world")).strip() == "hello world"